@@ -2,12 +2,17 @@ import pandas as pd
 import logging
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import IO, List, Optional, Union
 from io import StringIO
 
 from app.models import Transaction
 
 
+# CSV input may be given as text or as a (binary or text) file-like object such as
+# Streamlit's UploadedFile; file-like sources are rewound before every read.
+CSVSource = Union[str, IO]
+
+
 class CSVParser:
     """Parses CSV files in various bank formats and converts to Transaction objects."""
     
@@ -109,7 +114,41 @@ class CSVParser:
             }
         }
     
-    def validate_csv_format(self, csv_content: str, format_type: str = "auto") -> dict:
+    def _is_empty(self, source: CSVSource) -> bool:
+        """Check whether the CSV source has no content."""
+        if source is None:
+            return True
+        if isinstance(source, str):
+            return not source.strip()
+        source.seek(0)
+        head = source.read(1024)
+        source.seek(0)
+        return not head.strip()
+    
+    def _read_csv(self, source: CSVSource, **kwargs) -> pd.DataFrame:
+        """Read CSV data from text or a file-like object."""
+        if isinstance(source, str):
+            return pd.read_csv(StringIO(source), **kwargs)
+        source.seek(0)
+        return pd.read_csv(source, **kwargs)
+    
+    def _head_lines(self, source: CSVSource, count: int) -> List[str]:
+        """Return the first ``count`` non-empty lines of the CSV source."""
+        if isinstance(source, str):
+            return source.strip().split('\n')[:count]
+        source.seek(0)
+        lines = []
+        for line in source:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', errors='replace')
+            if line.strip():
+                lines.append(line.strip())
+            if len(lines) >= count:
+                break
+        source.seek(0)
+        return lines
+    
+    def validate_csv_format(self, csv_content: CSVSource, format_type: str = "auto") -> dict:
         """Validate if CSV content matches the expected format and return detailed results."""
         result = {
             'valid': False,
@@ -122,11 +161,12 @@ class CSVParser:
         }
         
         try:
-            if not csv_content or not csv_content.strip():
+            if self._is_empty(csv_content):
                 result['error_message'] = "CSV content is empty"
                 return result
             
-            df = pd.read_csv(StringIO(csv_content))
+            # Only the header (and a few rows for headerless checks) is needed here
+            df = self._read_csv(csv_content, nrows=5)
             result['actual_columns'] = list(df.columns)
             
             if format_type == "auto":
@@ -195,24 +235,15 @@ class CSVParser:
             self.logger.error(f"CSV validation failed: {e}")
             return result
     
-    def get_csv_preview(self, csv_content: str, max_rows: int = 5) -> pd.DataFrame:
-        """Get a preview of the CSV content."""
-        try:
-            df = pd.read_csv(StringIO(csv_content))
-            return df.head(max_rows)
-        except Exception as e:
-            self.logger.error(f"CSV preview failed: {e}")
-            return pd.DataFrame()
-    
-    def parse_chase_csv(self, csv_content: str) -> List[Transaction]:
+    def parse_chase_csv(self, csv_content: CSVSource) -> List[Transaction]:
         """Parse Chase credit card CSV format."""
         try:
             # Handle empty content
-            if not csv_content or not csv_content.strip():
+            if self._is_empty(csv_content):
                 return []
             
             # Read CSV content
-            df = pd.read_csv(StringIO(csv_content))
+            df = self._read_csv(csv_content)
             
             # Validate required columns
             required_columns = ['Transaction Date', 'Post Date', 'Description', 'Category', 'Type', 'Amount', 'Memo']
@@ -289,27 +320,26 @@ class CSVParser:
     
 
     
-    def get_csv_preview(self, csv_content: str, max_rows: int = 5) -> pd.DataFrame:
+    def get_csv_preview(self, csv_content: CSVSource, max_rows: int = 5) -> pd.DataFrame:
         """Get a preview of the CSV data for user verification."""
         try:
             # Handle empty content
-            if not csv_content or not csv_content.strip():
+            if self._is_empty(csv_content):
                 return pd.DataFrame()
             
-            df = pd.read_csv(StringIO(csv_content))
-            return df.head(max_rows)
+            return self._read_csv(csv_content, nrows=max_rows)
         except Exception as e:
             self.logger.error(f"Failed to generate CSV preview: {e}")
             return pd.DataFrame()
     
-    def detect_csv_format(self, csv_content: str) -> Optional[str]:
+    def detect_csv_format(self, csv_content: CSVSource) -> Optional[str]:
         """Attempt to detect the CSV format based on column headers or data patterns."""
         try:
-            if not csv_content or not csv_content.strip():
+            if self._is_empty(csv_content):
                 return None
             
             # First try with headers
-            df = pd.read_csv(StringIO(csv_content))
+            df = self._read_csv(csv_content, nrows=5)
             columns = set(df.columns)
             
             # Check each format in order of specificity (most specific first)
@@ -330,10 +360,10 @@ class CSVParser:
             self.logger.error(f"Failed to detect CSV format: {e}")
             return None
     
-    def _detect_headerless_format(self, csv_content: str) -> Optional[str]:
+    def _detect_headerless_format(self, csv_content: CSVSource) -> Optional[str]:
         """Detect CSV format for files without headers by analyzing data patterns."""
         try:
-            lines = csv_content.strip().split('\n')
+            lines = self._head_lines(csv_content, 2)
             if len(lines) < 2:
                 return None
             
@@ -361,12 +391,20 @@ class CSVParser:
             self.logger.error(f"Failed to detect headerless format: {e}")
             return None
     
-    def _parse_headerless_csv(self, csv_content: str, format_spec: dict) -> List[Transaction]:
+    def _parse_headerless_csv(self, csv_content: CSVSource, format_spec: dict) -> List[Transaction]:
         """Parse CSV content without headers using column indices."""
         try:
             # Read CSV without headers
-            df = pd.read_csv(StringIO(csv_content), header=None)
-            
+            df = self._read_csv(csv_content, header=None)
+        except Exception as e:
+            self.logger.error(f"Failed to parse headerless CSV: {e}")
+            return []
+        
+        return self._parse_headerless_frame(df, format_spec)
+    
+    def _parse_headerless_frame(self, df: pd.DataFrame, format_spec: dict) -> List[Transaction]:
+        """Parse rows of a headerless CSV (read with ``header=None``) using column indices."""
+        try:
             transactions = []
             column_mapping = format_spec['column_mapping']
             date_format = format_spec['date_format']
@@ -447,7 +485,7 @@ class CSVParser:
             for format_name, format_spec in self.formats.items()
         }
     
-    def parse_csv_auto(self, csv_content: str) -> List[Transaction]:
+    def parse_csv_auto(self, csv_content: CSVSource) -> List[Transaction]:
         """Parse CSV content with automatic format detection."""
         detected_format = self.detect_csv_format(csv_content)
         
@@ -457,13 +495,32 @@ class CSVParser:
         
         return self.parse_csv_generic(csv_content, detected_format)
     
-    def parse_csv_generic(self, csv_content: str, format_type: str) -> List[Transaction]:
+    def parse_csv_generic(self, csv_content: CSVSource, format_type: str) -> List[Transaction]:
         """Parse CSV content using the specified format."""
         try:
             # Handle empty content
-            if not csv_content or not csv_content.strip():
+            if self._is_empty(csv_content):
                 return []
             
+            df = self.read_csv_frame(csv_content, format_type)
+        except Exception as e:
+            self.logger.error(f"Failed to parse {format_type} CSV: {e}")
+            return []
+        
+        return self.parse_dataframe(df, format_type)
+    
+    def read_csv_frame(self, csv_content: CSVSource, format_type: str) -> pd.DataFrame:
+        """Read the whole CSV once, the way ``format_type`` expects (headerless formats get integer columns)."""
+        if format_type not in self.formats:
+            raise ValueError(f"Unsupported format: {format_type}")
+        
+        if self.formats[format_type].get('headerless', False):
+            return self._read_csv(csv_content, header=None)
+        return self._read_csv(csv_content)
+    
+    def parse_dataframe(self, df: pd.DataFrame, format_type: str) -> List[Transaction]:
+        """Parse transactions from a frame returned by ``read_csv_frame``."""
+        try:
             if format_type not in self.formats:
                 raise ValueError(f"Unsupported format: {format_type}")
             
@@ -471,10 +528,7 @@ class CSVParser:
             
             # Handle headerless formats
             if format_spec.get('headerless', False):
-                return self._parse_headerless_csv(csv_content, format_spec)
-            
-            # Read CSV content with headers
-            df = pd.read_csv(StringIO(csv_content))
+                return self._parse_headerless_frame(df, format_spec)
             
             # Validate required columns
             required_columns = format_spec['required_columns']
@@ -1,10 +1,21 @@
+import os
 import sqlite3
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from app.models import Transaction
+from app.models import Transaction, content_hash
+
+
+# Values bound per IN (...) query; SQLite allows 999 parameters per statement by default
+IN_QUERY_CHUNK_SIZE = 900
+
+# Columns that feed Transaction.content_hash()
+HASHED_FIELDS = {'transaction_date', 'amount', 'description'}
+
+# Bytes of the database file each connection may read through a memory map
+MMAP_SIZE = 256 * 1024 * 1024
 
 
 class DatabaseManager:
@@ -22,10 +33,21 @@ class DatabaseManager:
         self.logger = logging.getLogger(__name__)
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection settings applied."""
+        conn = sqlite3.connect(self.db_path)
+        # With WAL, NORMAL only syncs at checkpoints; a crash may drop recent commits but cannot corrupt the file
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Read pages through a memory map (shared via the OS page cache) instead of copying them per read
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        return conn
+    
     def _init_database(self):
         """Initialize database and create tables if they don't exist."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
+                # Write-ahead logging is persistent: readers no longer block the writer and commits append to the log
+                conn.execute("PRAGMA journal_mode=WAL")
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS transactions (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -37,10 +59,17 @@ class DatabaseManager:
                         amount REAL NOT NULL,
                         memo TEXT,
                         created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                        content_hash TEXT
                     )
                 """)
                 
+                # Databases created before content hashes were stored get the column and a backfill
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+                if 'content_hash' not in columns:
+                    conn.execute("ALTER TABLE transactions ADD COLUMN content_hash TEXT")
+                self._refresh_content_hashes(conn)
+                
                 # Create category hierarchy table
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS category_hierarchy (
@@ -61,6 +90,10 @@ class DatabaseManager:
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_description ON transactions(description)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_date_category ON transactions(transaction_date, category)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_date_amount ON transactions(transaction_date, amount)")
+                # Duplicate lookups match exact amounts within a date window
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_amount_date ON transactions(amount, transaction_date)")
+                # Not unique: duplicates the user chose to import keep the same hash
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_content_hash ON transactions(content_hash)")
                 
                 conn.commit()
                 self.logger.info(f"Database initialized at {self.db_path}")
@@ -68,14 +101,27 @@ class DatabaseManager:
             self.logger.error(f"Database initialization failed: {e}")
             raise
     
+    def _refresh_content_hashes(self, conn: sqlite3.Connection):
+        """Fill in content_hash for rows that do not have one (new column or edited key fields)."""
+        rows = conn.execute("""
+            SELECT id, transaction_date, amount, description FROM transactions
+            WHERE content_hash IS NULL
+        """).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE transactions SET content_hash = ? WHERE id = ?",
+                ((content_hash(transaction_date, amount, description), transaction_id)
+                 for transaction_id, transaction_date, amount, description in rows)
+            )
+    
     def insert_transaction(self, transaction: Transaction) -> int:
         """Insert a single transaction and return its ID."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     INSERT INTO transactions 
-                    (transaction_date, post_date, description, category, transaction_type, amount, memo)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    (transaction_date, post_date, description, category, transaction_type, amount, memo, content_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     transaction.transaction_date.isoformat(),
                     transaction.post_date.isoformat(),
@@ -83,7 +129,8 @@ class DatabaseManager:
                     transaction.category,
                     transaction.transaction_type,
                     float(transaction.amount),
-                    transaction.memo
+                    transaction.memo,
+                    transaction.content_hash()
                 ))
                 transaction_id = cursor.lastrowid
                 conn.commit()
@@ -98,25 +145,20 @@ class DatabaseManager:
         if not transactions:
             return []
         
-        transaction_ids = []
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for transaction in transactions:
-                    cursor = conn.execute("""
-                        INSERT INTO transactions 
-                        (transaction_date, post_date, description, category, transaction_type, amount, memo)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        transaction.transaction_date.isoformat(),
-                        transaction.post_date.isoformat(),
-                        transaction.description,
-                        transaction.category,
-                        transaction.transaction_type,
-                        float(transaction.amount),
-                        transaction.memo
-                    ))
-                    transaction_ids.append(cursor.lastrowid)
-                
+            rows = (
+                (
+                    t.transaction_date.isoformat(),
+                    t.post_date.isoformat(),
+                    t.description,
+                    t.category,
+                    t.transaction_type,
+                    float(t.amount),
+                    t.memo
+                ) for t in transactions
+            )
+            with self._connect() as conn:
+                transaction_ids = self._insert_rows(conn, rows)
                 conn.commit()
                 self.logger.info(f"Inserted {len(transaction_ids)} transactions in batch")
                 return transaction_ids
@@ -124,6 +166,72 @@ class DatabaseManager:
             self.logger.error(f"Failed to insert transactions batch: {e}")
             return []
     
+    def _insert_rows(self, conn: sqlite3.Connection, rows) -> List[int]:
+        """Insert row tuples with executemany and return their (contiguous) IDs."""
+        # Rows are (transaction_date, post_date, description, category, transaction_type, amount, memo)
+        cursor = conn.executemany("""
+            INSERT INTO transactions 
+            (transaction_date, post_date, description, category, transaction_type, amount, memo, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (row + (content_hash(row[0], row[5], row[2]),) for row in rows))
+        inserted = cursor.rowcount
+        if inserted <= 0:
+            return []
+        
+        # The write lock is held until commit, so AUTOINCREMENT IDs are consecutive
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - inserted + 1, last_id + 1))
+    
+    def backup_to(self, backup_path: str):
+        """Write a consistent copy of the database (including un-checkpointed WAL pages) to ``backup_path``."""
+        try:
+            with self._connect() as source:
+                target = sqlite3.connect(str(backup_path))
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+            self.logger.info(f"Backed up database to {backup_path}")
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to back up database: {e}")
+            raise
+    
+    def restore_from(self, backup_path: str):
+        """Replace the database contents with those of the SQLite file at ``backup_path``."""
+        try:
+            source = sqlite3.connect(str(backup_path))
+            try:
+                with self._connect() as target:
+                    source.backup(target)
+            finally:
+                source.close()
+            
+            # Recreate any tables or indexes the backup predates
+            self._init_database()
+            self.logger.info(f"Restored database from {backup_path}")
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to restore database: {e}")
+            raise
+    
+    def analyze(self) -> Dict[str, Any]:
+        """Refresh query-planner statistics; returns the database ``size`` and ``indexes``."""
+        try:
+            with self._connect() as conn:
+                # Sample at most ~400 rows per index so the cost stays flat as the table grows
+                conn.execute("PRAGMA analysis_limit=400")
+                conn.execute("ANALYZE")
+                
+                cursor = conn.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()")
+                size = cursor.fetchone()[0]
+                cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name NOT LIKE 'sqlite_%'")
+                indexes = [row[0] for row in cursor.fetchall()]
+            
+            self.logger.info("Analyzed database statistics")
+            return {'size': size, 'indexes': indexes}
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to analyze database: {e}")
+            raise
+    
     def create_category(self, category_name: str, parent_category: str = None) -> bool:
         """Create a new category and optionally add it to hierarchy."""
         try:
@@ -142,7 +250,7 @@ class DatabaseManager:
         """Check if a category exists in transactions or hierarchy."""
         try:
             # Check if category exists in transactions
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM transactions WHERE category = ?", (category_name,))
                 transaction_count = cursor.fetchone()[0]
                 
@@ -157,49 +265,11 @@ class DatabaseManager:
         except sqlite3.Error as e:
             self.logger.error(f"Failed to check category existence: {e}")
             return False
-        
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                transaction_data = [
-                    (
-                        t.transaction_date.isoformat(),
-                        t.post_date.isoformat(),
-                        t.description,
-                        t.category,
-                        t.transaction_type,
-                        float(t.amount),
-                        t.memo
-                    ) for t in transactions
-                ]
-                
-                cursor.executemany("""
-                    INSERT INTO transactions 
-                    (transaction_date, post_date, description, category, transaction_type, amount, memo)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, transaction_data)
-                
-                # Get the IDs of inserted transactions
-                if cursor.lastrowid is not None:
-                    first_id = cursor.lastrowid - len(transactions) + 1
-                    transaction_ids = list(range(first_id, cursor.lastrowid + 1))
-                else:
-                    # Fallback: query for the last inserted IDs
-                    cursor.execute("SELECT id FROM transactions ORDER BY id DESC LIMIT ?", (len(transactions),))
-                    transaction_ids = [row[0] for row in cursor.fetchall()]
-                    transaction_ids.reverse()  # Restore insertion order
-                
-                conn.commit()
-                self.logger.info(f"Inserted {len(transactions)} transactions")
-                return transaction_ids
-        except sqlite3.Error as e:
-            self.logger.error(f"Failed to insert transactions batch: {e}")
-            raise
     
     def get_all_transactions(self) -> List[Transaction]:
         """Retrieve all transactions from the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT * FROM transactions 
@@ -221,7 +291,7 @@ class DatabaseManager:
     def get_transactions_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Transaction]:
         """Retrieve transactions within a specific date range."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT * FROM transactions 
@@ -244,7 +314,7 @@ class DatabaseManager:
     def get_transactions_by_category(self, category: str) -> List[Transaction]:
         """Retrieve transactions for a specific category."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT * FROM transactions 
@@ -266,7 +336,7 @@ class DatabaseManager:
     def update_transaction_category(self, transaction_id: int, new_category: str) -> bool:
         """Update the category of a specific transaction."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     UPDATE transactions 
                     SET category = ?, updated_at = CURRENT_TIMESTAMP
@@ -311,17 +381,20 @@ class DatabaseManager:
                 return False
             
             set_clauses.append("updated_at = CURRENT_TIMESTAMP")
+            if HASHED_FIELDS.intersection(updates):
+                set_clauses.append("content_hash = NULL")
             params.append(transaction_id)
             
             query = f"UPDATE transactions SET {', '.join(set_clauses)} WHERE id = ?"
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(query, params)
                 
                 if cursor.rowcount == 0:
                     self.logger.warning(f"No transaction found with ID {transaction_id}")
                     return False
                 
+                self._refresh_content_hashes(conn)
                 conn.commit()
                 self.logger.info(f"Updated transaction {transaction_id} with fields: {list(updates.keys())}")
                 return True
@@ -356,14 +429,21 @@ class DatabaseManager:
                 return 0
             
             set_clauses.append("updated_at = CURRENT_TIMESTAMP")
-            params.extend(transaction_ids)
+            if HASHED_FIELDS.intersection(updates):
+                set_clauses.append("content_hash = NULL")
+            set_sql = ', '.join(set_clauses)
             
-            placeholders = ','.join(['?' for _ in transaction_ids])
-            query = f"UPDATE transactions SET {', '.join(set_clauses)} WHERE id IN ({placeholders})"
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(query, params)
-                updated_count = cursor.rowcount
+            with self._connect() as conn:
+                # One statement per chunk of ids, all committed together
+                updated_count = 0
+                for start in range(0, len(transaction_ids), IN_QUERY_CHUNK_SIZE):
+                    chunk = list(transaction_ids[start:start + IN_QUERY_CHUNK_SIZE])
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor = conn.execute(
+                        f"UPDATE transactions SET {set_sql} WHERE id IN ({placeholders})", params + chunk
+                    )
+                    updated_count += cursor.rowcount
+                self._refresh_content_hashes(conn)
                 conn.commit()
                 self.logger.info(f"Updated {updated_count} transactions with fields: {list(updates.keys())}")
                 return updated_count
@@ -374,7 +454,7 @@ class DatabaseManager:
     def delete_transaction(self, transaction_id: int) -> bool:
         """Delete a specific transaction."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
                 
                 if cursor.rowcount == 0:
@@ -394,7 +474,7 @@ class DatabaseManager:
             return 0
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 placeholders = ','.join(['?' for _ in transaction_ids])
                 cursor = conn.execute(f"DELETE FROM transactions WHERE id IN ({placeholders})", transaction_ids)
                 
@@ -409,7 +489,7 @@ class DatabaseManager:
     def delete_all_transactions(self) -> int:
         """Delete all transactions. Returns number of deleted transactions."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("DELETE FROM transactions")
                 deleted_count = cursor.rowcount
                 conn.commit()
@@ -459,7 +539,7 @@ class DatabaseManager:
             where_clause = " AND ".join(conditions)
             query = f"DELETE FROM transactions WHERE {where_clause}"
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(query, params)
                 deleted_count = cursor.rowcount
                 conn.commit()
@@ -472,7 +552,7 @@ class DatabaseManager:
     def get_categories(self) -> List[str]:
         """Get all unique categories from transactions."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT DISTINCT category FROM transactions 
                     WHERE category IS NOT NULL AND category != ''
@@ -484,10 +564,25 @@ class DatabaseManager:
             self.logger.error(f"Failed to retrieve categories: {e}")
             raise
     
+    def change_token(self) -> Tuple:
+        """Value that changes whenever any connection or process commits to the database.
+        
+        Commits append to the write-ahead log and checkpoints rewrite the main file, so the modification
+        times and sizes of both files move on every write, while reads leave them alone.
+        """
+        token = []
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            try:
+                stat = os.stat(path)
+                token.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                token.append(None)
+        return tuple(token)
+    
     def get_transaction_count(self) -> int:
         """Get total number of transactions."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM transactions")
                 count = cursor.fetchone()[0]
                 return count
@@ -495,41 +590,30 @@ class DatabaseManager:
             self.logger.error(f"Failed to get transaction count: {e}")
             raise
     
+    def get_expense_payment_counts(self) -> Tuple[int, int]:
+        """Get the number of expense (negative) and payment (positive) transactions."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute("""
+                    SELECT COALESCE(SUM(amount < 0), 0), COALESCE(SUM(amount > 0), 0)
+                    FROM transactions
+                """)
+                expense_count, payment_count = cursor.fetchone()
+                return expense_count, payment_count
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to get expense and payment counts: {e}")
+            raise
+    
     def transaction_exists(self, transaction: Transaction) -> bool:
         """Check if a transaction already exists (duplicate detection)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Primary check: exact match on key fields
-                cursor = conn.execute("""
-                    SELECT COUNT(*) FROM transactions 
-                    WHERE transaction_date = ? AND post_date = ? 
-                    AND description = ? AND amount = ?
-                """, (
-                    transaction.transaction_date.isoformat(),
-                    transaction.post_date.isoformat(),
-                    transaction.description,
-                    float(transaction.amount)
-                ))
-                count = cursor.fetchone()[0]
-                
-                if count > 0:
-                    return True
-                
-                # Secondary check: fuzzy match for potential duplicates
-                # Check for same date and amount with similar description
-                cursor = conn.execute("""
-                    SELECT COUNT(*) FROM transactions 
-                    WHERE transaction_date = ? AND amount = ?
-                    AND (description = ? OR LOWER(description) = LOWER(?))
-                """, (
-                    transaction.transaction_date.isoformat(),
-                    float(transaction.amount),
-                    transaction.description,
-                    transaction.description
-                ))
-                fuzzy_count = cursor.fetchone()[0]
-                
-                return fuzzy_count > 0
+            with self._connect() as conn:
+                # Same date and amount with a case-insensitively equal description, via the hash index
+                cursor = conn.execute(
+                    "SELECT 1 FROM transactions WHERE content_hash = ? LIMIT 1",
+                    (transaction.content_hash(),)
+                )
+                return cursor.fetchone() is not None
         except sqlite3.Error as e:
             self.logger.error(f"Failed to check transaction existence: {e}")
             raise
@@ -540,7 +624,7 @@ class DatabaseManager:
             start_date = (transaction.transaction_date - timedelta(days=tolerance_days)).isoformat()
             end_date = (transaction.transaction_date + timedelta(days=tolerance_days)).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT * FROM transactions 
@@ -565,10 +649,73 @@ class DatabaseManager:
             self.logger.error(f"Failed to find potential duplicates: {e}")
             raise
     
+    def transactions_exist_batch(self, transactions: List[Transaction]) -> List[bool]:
+        """Batch version of transaction_exists: one flag per transaction, found with chunked IN queries."""
+        hashes = [t.content_hash() for t in transactions]
+        distinct = sorted(set(hashes))
+        
+        try:
+            existing = set()
+            with self._connect() as conn:
+                for start in range(0, len(distinct), IN_QUERY_CHUNK_SIZE):
+                    chunk = distinct[start:start + IN_QUERY_CHUNK_SIZE]
+                    cursor = conn.execute(f"""
+                        SELECT content_hash FROM transactions
+                        WHERE content_hash IN ({','.join('?' * len(chunk))})
+                    """, chunk)
+                    existing.update(row[0] for row in cursor)
+            
+            return [transaction_hash in existing for transaction_hash in hashes]
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to check transaction existence: {e}")
+            raise
+    
+    def find_potential_duplicates_batch(self, transactions: List[Transaction],
+                                        tolerance_days: int = 1) -> List[List[Transaction]]:
+        """Batch version of find_potential_duplicates: one list of matches per transaction."""
+        if not transactions:
+            return []
+        
+        amounts = sorted({float(t.amount) for t in transactions})
+        # Only rows inside the overall date window can match any transaction; (amount, transaction_date)
+        # is indexed, so each amount probe reads just that window
+        window_start = (min(t.transaction_date for t in transactions) - timedelta(days=tolerance_days)).isoformat()
+        window_end = (max(t.transaction_date for t in transactions) + timedelta(days=tolerance_days)).isoformat()
+        
+        try:
+            candidates: Dict[float, List[Transaction]] = {}
+            with self._connect() as conn:
+                conn.row_factory = sqlite3.Row
+                for start in range(0, len(amounts), IN_QUERY_CHUNK_SIZE):
+                    chunk = amounts[start:start + IN_QUERY_CHUNK_SIZE]
+                    cursor = conn.execute(f"""
+                        SELECT * FROM transactions
+                        WHERE amount IN ({','.join('?' * len(chunk))})
+                          AND transaction_date BETWEEN ? AND ?
+                    """, chunk + [window_start, window_end])
+                    for row in cursor:
+                        candidates.setdefault(row['amount'], []).append(Transaction.from_dict(dict(row)))
+            
+            duplicates = []
+            for transaction in transactions:
+                start_date = transaction.transaction_date - timedelta(days=tolerance_days)
+                end_date = transaction.transaction_date + timedelta(days=tolerance_days)
+                description = transaction.description.lower()
+                duplicates.append([
+                    candidate for candidate in candidates.get(float(transaction.amount), [])
+                    if start_date <= candidate.transaction_date <= end_date
+                    and candidate.description.lower() == description
+                ])
+            
+            return duplicates
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to find potential duplicates: {e}")
+            raise
+    
     def rename_category(self, old_category: str, new_category: str) -> int:
         """Rename a category across all transactions. Returns number of transactions updated."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     UPDATE transactions 
                     SET category = ?, updated_at = CURRENT_TIMESTAMP
@@ -586,7 +733,7 @@ class DatabaseManager:
     def merge_categories(self, categories_to_merge: List[str], target_category: str) -> int:
         """Merge multiple categories into a target category. Returns number of transactions updated."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 placeholders = ','.join(['?' for _ in categories_to_merge])
                 cursor = conn.execute(f"""
                     UPDATE transactions 
@@ -605,7 +752,7 @@ class DatabaseManager:
     def delete_category(self, category: str, replacement_category: str = "Uncategorized") -> int:
         """Delete a category by replacing it with a replacement category. Returns number of transactions updated."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     UPDATE transactions 
                     SET category = ?, updated_at = CURRENT_TIMESTAMP
@@ -623,7 +770,7 @@ class DatabaseManager:
     def get_category_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for each category including transaction count and total amounts."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT 
                         category,
@@ -728,7 +875,7 @@ class DatabaseManager:
             if order_by not in valid_columns:
                 order_by = 'transaction_date'
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute(f"""
                     SELECT * FROM transactions 
@@ -752,7 +899,7 @@ class DatabaseManager:
         try:
             search_pattern = f"%{search_term.lower()}%"
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT * FROM transactions 
@@ -820,7 +967,7 @@ class DatabaseManager:
             
             query = " ".join(query_parts)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute(query, params)
                 rows = cursor.fetchall()
@@ -836,10 +983,90 @@ class DatabaseManager:
             self.logger.error(f"Failed to retrieve filtered transactions: {e}")
             raise
     
+    def get_aggregate_stats(self, start_date: datetime = None, end_date: datetime = None,
+                            category: str = None, expenses_only: bool = False, payments_only: bool = False,
+                            min_amount: float = None, max_amount: float = None) -> Dict[str, Any]:
+        """Dashboard totals over every stored transaction matching the filters, computed by SQLite.
+        
+        Dates are inclusive days; expense figures are positive magnitudes. ``category_totals`` maps each
+        category with expenses to its total and ``monthly`` lists ``(YYYY-MM, expense total)`` in month order.
+        """
+        conditions = []
+        params = []
+        
+        if start_date:
+            conditions.append("transaction_date >= ?")
+            params.append(start_date.isoformat())
+        
+        if end_date:
+            conditions.append("transaction_date < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+        
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        
+        if expenses_only:
+            conditions.append("amount < 0")
+        elif payments_only:
+            conditions.append("amount > 0")
+        
+        if min_amount is not None:
+            conditions.append("ABS(amount) >= ?")
+            params.append(min_amount)
+        
+        if max_amount is not None:
+            conditions.append("ABS(amount) <= ?")
+            params.append(max_amount)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        expense_where = f"{where} AND amount < 0" if conditions else "WHERE amount < 0"
+        
+        try:
+            with self._connect() as conn:
+                (transactions, expense_count, total_expenses, total_payments, net_amount, max_expense,
+                 first_date, last_date) = conn.execute(f"""
+                    SELECT COUNT(*),
+                           COALESCE(SUM(amount < 0), 0),
+                           COALESCE(SUM(CASE WHEN amount < 0 THEN -amount END), 0),
+                           COALESCE(SUM(CASE WHEN amount > 0 THEN amount END), 0),
+                           COALESCE(SUM(amount), 0),
+                           COALESCE(MAX(CASE WHEN amount < 0 THEN -amount END), 0),
+                           MIN(transaction_date),
+                           MAX(transaction_date)
+                    FROM transactions {where}
+                """, params).fetchone()
+                
+                category_totals = dict(conn.execute(f"""
+                    SELECT category, SUM(-amount) FROM transactions {expense_where}
+                    GROUP BY category
+                """, params).fetchall())
+                
+                monthly = conn.execute(f"""
+                    SELECT substr(transaction_date, 1, 7) AS month, SUM(-amount) FROM transactions {expense_where}
+                    GROUP BY month ORDER BY month
+                """, params).fetchall()
+            
+            return {
+                'transactions': transactions,
+                'expense_count': expense_count,
+                'total_expenses': total_expenses,
+                'total_payments': total_payments,
+                'net_amount': net_amount,
+                'max_expense': max_expense,
+                'first_date': datetime.fromisoformat(first_date) if first_date else None,
+                'last_date': datetime.fromisoformat(last_date) if last_date else None,
+                'category_totals': category_totals,
+                'monthly': monthly
+            }
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to compute aggregate stats: {e}")
+            raise
+    
     def get_category_stats_optimized(self) -> Dict[str, Dict[str, Any]]:
         """Get category statistics with optimized single query."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT 
                         category,
@@ -877,7 +1104,7 @@ class DatabaseManager:
     def add_category_hierarchy(self, category_name: str, parent_category: str = None) -> bool:
         """Add a category to the hierarchy."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Calculate level based on parent
                 level = 0
                 if parent_category:
@@ -906,7 +1133,7 @@ class DatabaseManager:
     def get_category_hierarchy(self) -> Dict[str, Dict]:
         """Get the complete category hierarchy."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT category_name, parent_category, level 
@@ -991,7 +1218,7 @@ class DatabaseManager:
         """Check if a category exists in transactions or hierarchy."""
         try:
             # Check if category exists in transactions
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM transactions WHERE category = ?", (category_name,))
                 transaction_count = cursor.fetchone()[0]
                 
@@ -1039,7 +1266,7 @@ class DatabaseManager:
         """Check if a category exists in transactions or hierarchy."""
         try:
             # Check if category exists in transactions
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM transactions WHERE category = ?", (category_name,))
                 transaction_count = cursor.fetchone()[0]
                 
@@ -1062,7 +1289,7 @@ class DatabaseManager:
             if include_children:
                 categories.extend(self.get_category_children(category_name))
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 placeholders = ','.join(['?' for _ in categories])
                 cursor = conn.execute(f"""
@@ -1100,7 +1327,7 @@ class DatabaseManager:
         """Check if a category exists in transactions or hierarchy."""
         try:
             # Check if category exists in transactions
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM transactions WHERE category = ?", (category_name,))
                 transaction_count = cursor.fetchone()[0]
                 
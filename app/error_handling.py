@@ -163,6 +163,8 @@ class ProgressTracker:
         self.operation_name = operation_name
         self.progress_bar = st.progress(0)
         self.status_text = st.empty()
+        self.shown_percent = -1
+        self.shown_message = None
         self.logger = logging.getLogger(__name__)
     
     def update(self, step: int, message: str = ""):
@@ -170,12 +172,21 @@ class ProgressTracker:
         self.current_step = step
         progress = min(step / self.total_steps, 1.0)
         
-        self.progress_bar.progress(progress)
+        # Redraw the bar only when it moves by a whole percent, so at most ~100 bar updates reach the
+        # browser however often callers report
+        percent = int(progress * 100)
+        moved = percent > self.shown_percent
+        if moved:
+            self.shown_percent = percent
+            self.progress_bar.progress(progress)
         
-        if message:
-            self.status_text.text(f"{self.operation_name}: {message}")
-        else:
-            self.status_text.text(f"{self.operation_name}: Step {step} of {self.total_steps}")
+        # Status text follows every new message; the default step count only changes with the bar
+        if not message and moved:
+            message = f"Step {step} of {self.total_steps}"
+        if not message or message == self.shown_message:
+            return
+        self.shown_message = message
+        self.status_text.text(f"{self.operation_name}: {message}")
         
         self.logger.info(f"{self.operation_name} progress: {step}/{self.total_steps} - {message}")
     
@@ -4,13 +4,40 @@ import json
 import csv
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from io import StringIO, BytesIO
 import logging
 
 from app.models import Transaction
 from app.db import DatabaseManager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # orjson is optional; the standard library gives the same documents
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_json_stdlib(data: Any, pretty: bool = True) -> str:
+    """``dumps_json`` with the standard library, laid out the way orjson writes it."""
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps_json(data: Any, pretty: bool = True) -> str:
+    """Serialize export data to JSON text, two-space indented when ``pretty``.
+    
+    Both encoders give the same text for export data. They differ on values JSON cannot hold (orjson
+    writes NaN and infinity as ``null``, the standard library as ``NaN``/``Infinity``) and on floats written
+    in exponent form (``1e-7`` against ``1e-07``), which still parse to the same values.
+    """
+    if ORJSON_AVAILABLE:
+        # Compiled encoder; the standard library falls back to pure Python whenever it indents
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option).decode('utf-8')
+    return _dumps_json_stdlib(data, pretty)
+
 
 class DataExporter:
     """Handle data export operations."""
@@ -61,10 +88,7 @@ class DataExporter:
         """Export transactions to JSON format."""
         export_data = self.db.export_transactions_to_dict(transactions)
         
-        if pretty:
-            json_content = json.dumps(export_data, indent=2, ensure_ascii=False)
-        else:
-            json_content = json.dumps(export_data, ensure_ascii=False)
+        json_content = dumps_json(export_data, pretty)
         
         self.logger.info(f"Exported {len(export_data['transactions'])} transactions to JSON")
         return json_content
@@ -115,8 +139,8 @@ class DataImporter:
         self.db = db_manager
         self.logger = logging.getLogger(__name__)
     
-    def import_from_json(self, json_content: str) -> Dict[str, int]:
-        """Import transactions from JSON format."""
+    def import_from_json(self, json_content: Union[str, bytes]) -> Dict[str, int]:
+        """Import transactions from JSON text or UTF-8 encoded bytes."""
         try:
             import_data = json.loads(json_content)
             result = self.db.import_transactions_from_dict(import_data)
@@ -131,8 +155,8 @@ class DataImporter:
             self.logger.error(f"JSON import failed: {e}")
             raise
     
-    def validate_json_import(self, json_content: str) -> Dict[str, Any]:
-        """Validate JSON import data and return summary."""
+    def validate_json_import(self, json_content: Union[str, bytes]) -> Dict[str, Any]:
+        """Validate JSON import data (text or UTF-8 encoded bytes) and return summary."""
         try:
             import_data = json.loads(json_content)
             
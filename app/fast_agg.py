@@ -0,0 +1,109 @@
+"""Aggregation kernels for dashboard totals, compiled with numba when it is installed."""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; NumPy gives the same results
+    NUMBA_AVAILABLE = False
+
+
+def _sum_by_code_numpy(codes: np.ndarray, weights: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-code sums and row counts for codes in ``[0, size)``."""
+    return (np.bincount(codes, weights=weights, minlength=size),
+            np.bincount(codes, minlength=size))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _sum_by_code(codes, weights, size):
+        """Per-code sums and row counts for codes in ``[0, size)`` in a single pass."""
+        totals = np.zeros(size)
+        counts = np.zeros(size, dtype=np.int64)
+        for i in range(codes.size):
+            totals[codes[i]] += weights[i]
+            counts[codes[i]] += 1
+        return totals, counts
+else:
+    _sum_by_code = _sum_by_code_numpy
+
+
+def _amount_summary_numpy(amounts: np.ndarray, codes: np.ndarray, size: int) -> Tuple:
+    """Expense/payment totals, largest expense, expense count and per-code expense sums and counts."""
+    expense = amounts < 0
+    expense_amounts = -amounts[expense]
+    expense_codes = codes[expense]
+    used = expense_codes >= 0
+    totals, counts = _sum_by_code_numpy(expense_codes[used], expense_amounts[used], size)
+    return (expense_amounts.sum(), amounts[amounts > 0].sum(), expense_amounts.max(initial=0.0),
+            expense_amounts.size, totals, counts)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _amount_summary(amounts, codes, size):
+        """Expense/payment totals, largest expense, expense count and per-code expense sums and counts in one pass."""
+        total_expenses = 0.0
+        total_payments = 0.0
+        max_expense = 0.0
+        expense_count = 0
+        totals = np.zeros(size)
+        counts = np.zeros(size, dtype=np.int64)
+        for i in range(amounts.size):
+            amount = amounts[i]
+            if amount < 0:
+                expense = -amount
+                total_expenses += expense
+                expense_count += 1
+                if expense > max_expense:
+                    max_expense = expense
+                code = codes[i]
+                if code >= 0:
+                    totals[code] += expense
+                    counts[code] += 1
+            elif amount > 0:
+                total_payments += amount
+        return total_expenses, total_payments, max_expense, expense_count, totals, counts
+else:
+    _amount_summary = _amount_summary_numpy
+
+
+def aggregate_by_category(codes: np.ndarray, amounts: np.ndarray, n_categories: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum ``amounts`` per category code in ``[0, n_categories)``; returns ``(totals, row counts)``."""
+    return _sum_by_code(
+        np.ascontiguousarray(codes, dtype=np.int64),
+        np.ascontiguousarray(amounts, dtype=np.float64),
+        n_categories
+    )
+
+
+def summarize_amounts(amounts: np.ndarray, codes: np.ndarray, n_categories: int) -> Tuple:
+    """Read signed ``amounts`` once for the dashboard figures.
+
+    Returns ``(total expenses, total payments, largest expense, expense count, per-category expense
+    totals, per-category expense counts)``; expenses are reported as positive magnitudes and rows
+    with category code -1 count towards the totals but not towards any category.
+    """
+    return _amount_summary(
+        np.ascontiguousarray(amounts, dtype=np.float64),
+        np.ascontiguousarray(codes, dtype=np.int64),
+        n_categories
+    )
+
+
+def aggregate_by_month(dates: np.ndarray, amounts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum ``amounts`` per calendar month; returns ``(months as datetime64[M] ascending, totals)``."""
+    ordinals = np.asarray(dates).astype('datetime64[M]').astype(np.int64)
+    if not len(ordinals):
+        return np.array([], dtype='datetime64[M]'), np.array([], dtype=np.float64)
+
+    first = ordinals.min()
+    offsets = ordinals - first
+    totals, counts = _sum_by_code(
+        offsets, np.ascontiguousarray(amounts, dtype=np.float64), int(offsets.max()) + 1
+    )
+    present = counts > 0
+    return (np.flatnonzero(present) + first).astype('datetime64[M]'), totals[present]
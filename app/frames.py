@@ -0,0 +1,290 @@
+"""Columnar (pandas) views of transactions for display and aggregation."""
+
+import re
+from datetime import date
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.fast_agg import aggregate_by_category, aggregate_by_month, summarize_amounts
+from app.models import Transaction
+
+
+FRAME_COLUMNS = ['id', 'transaction_date', 'description', 'category',
+                 'transaction_type', 'amount', 'memo']
+
+# Arrow-backed strings: compact storage and vectorized .str kernels
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+TEXT_COLUMNS = ['description', 'transaction_type', 'memo']
+
+DISPLAY_COLUMNS = ['Select', 'ID', 'Date', 'Description', 'Category', 'Type', 'Amount', 'Memo']
+
+# Reads one transaction's FRAME_COLUMNS values as a tuple in a single C-level call
+_frame_record = attrgetter(*FRAME_COLUMNS)
+
+
+def transactions_to_frame(transactions: List[Transaction]) -> pd.DataFrame:
+    """Build a frame whose row ``i`` describes ``transactions[i]``."""
+    frame = pd.DataFrame.from_records(list(map(_frame_record, transactions)), columns=FRAME_COLUMNS)
+    frame['transaction_date'] = pd.to_datetime(frame['transaction_date'])
+    # Amounts may be Decimals; converted for the whole column at once
+    frame['amount'] = frame['amount'].astype(float)
+    frame = frame.astype({column: TEXT_DTYPE for column in TEXT_COLUMNS})
+    # Few distinct categories: integer codes make grouping and equality tests cheap
+    frame['category'] = frame['category'].astype('category')
+    # Same definitions as Transaction.is_expense() / Transaction.is_payment()
+    frame['is_expense'] = frame['amount'] < 0
+    frame['is_payment'] = frame['amount'] > 0
+    # Charts, filters and totals work on magnitudes; take them once here
+    frame['abs_amount'] = frame['amount'].abs()
+    return frame
+
+
+def day_array(frame: pd.DataFrame) -> np.ndarray:
+    """Return the transaction dates of ``frame`` as a ``datetime64[D]`` array."""
+    return frame['transaction_date'].to_numpy().astype('datetime64[D]')
+
+
+def date_range_bounds(days_newest_first: np.ndarray, start_date: date, end_date: date) -> Tuple[int, int]:
+    """Return ``(lo, hi)`` so that rows ``lo:hi`` of a newest-first day array fall in ``[start_date, end_date]``."""
+    ascending = days_newest_first[::-1]
+    first = np.searchsorted(ascending, np.datetime64(start_date, 'D'), side='left')
+    last = np.searchsorted(ascending, np.datetime64(end_date, 'D'), side='right')
+    total = len(days_newest_first)
+    return int(total - last), int(total - first)
+
+
+def filter_mask(frame: pd.DataFrame, category: Optional[str] = None,
+                expenses_only: bool = False, payments_only: bool = False,
+                amount_range: Optional[Tuple[float, float]] = None) -> np.ndarray:
+    """Boolean row mask for the category, type and absolute-amount filters."""
+    mask = np.ones(len(frame), dtype=bool)
+    if category is not None:
+        mask &= (frame['category'] == category).to_numpy()
+    if expenses_only:
+        mask &= frame['is_expense'].to_numpy()
+    elif payments_only:
+        mask &= frame['is_payment'].to_numpy()
+    if amount_range is not None:
+        min_amount, max_amount = amount_range
+        abs_amounts = frame['abs_amount'].to_numpy()
+        mask &= (abs_amounts >= min_amount) & (abs_amounts <= max_amount)
+    return mask
+
+
+def add_search_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add lowercased copies of the free-text columns so searches need not lowercase per keystroke."""
+    frame['description_lc'] = frame['description'].str.lower()
+    frame['memo_lc'] = frame['memo'].fillna('').str.lower()
+    return frame
+
+
+def search_mask(frame: pd.DataFrame, term: str) -> np.ndarray:
+    """Rows whose description, category or memo contains ``term`` (case-insensitive)."""
+    term = term.lower()
+    mask = frame['description_lc'].str.contains(term, regex=False).to_numpy(dtype=bool)
+    mask |= frame['memo_lc'].str.contains(term, regex=False).to_numpy(dtype=bool)
+
+    # Match each distinct category once; code -1 (missing) picks the trailing False
+    category = frame['category'].cat
+    matches = category.categories.str.lower().str.contains(term, regex=False)
+    mask |= np.append(np.asarray(matches, dtype=bool), False)[category.codes.to_numpy()]
+    return mask
+
+
+def keyword_matches(frame: pd.DataFrame, patterns: Dict[str, List[str]]) -> np.ndarray:
+    """Position in ``patterns`` of the first category with a keyword in each row's description, or -1."""
+    result = np.full(len(frame), -1, dtype=np.int64)
+    unmatched = np.arange(len(frame))
+
+    for index, keywords in enumerate(patterns.values()):
+        if not len(unmatched):
+            break
+        # One alternation per category, matched over the column, instead of a substring test per keyword;
+        # rows already claimed by an earlier category are not searched again
+        regex = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+        hits = frame['description_lc'].iloc[unmatched].str.contains(regex, regex=True).to_numpy(dtype=bool)
+        result[unmatched[hits]] = index
+        unmatched = unmatched[~hits]
+    return result
+
+
+def _sort_key(frame: pd.DataFrame, key: str) -> np.ndarray:
+    """Numeric array that orders rows like the corresponding ``Transaction`` attribute."""
+    if key == 'date':
+        return frame['transaction_date'].to_numpy().view('i8')
+    if key == 'amount':
+        return frame['abs_amount'].to_numpy()
+    if key == 'description':
+        return pd.factorize(frame['description_lc'], sort=True)[0]
+    if key == 'category':
+        # Rank the distinct lowercased categories once, then look each row up by code
+        category = frame['category'].cat
+        ranks = pd.factorize(category.categories.str.lower(), sort=True)[0]
+        return np.append(ranks, -1)[category.codes.to_numpy()]
+    raise ValueError(f"Unknown sort key: {key}")
+
+
+def sort_order(frame: pd.DataFrame, key: str, descending: bool = False,
+               limit: Optional[int] = None) -> np.ndarray:
+    """Positions that stably sort ``frame`` by ``key`` ('date', 'amount', 'description' or 'category').
+
+    With ``limit``, only the first ``limit`` positions of that order are returned.
+    """
+    values = _sort_key(frame, key)
+    if descending:
+        values = -values
+
+    if limit is not None and 0 < limit < len(values) // 4:
+        # Partition instead of sorting everything; keeping all rows tied with the cut-off
+        # value preserves the stable order of the rows that make the cut
+        threshold = np.partition(values, limit - 1)[limit - 1]
+        candidates = np.flatnonzero(values <= threshold)
+        return candidates[np.argsort(values[candidates], kind='stable')][:limit]
+    return np.argsort(values, kind='stable')[:limit]
+
+
+def category_summary(expenses: pd.DataFrame) -> pd.DataFrame:
+    """Total absolute ``amount`` and row ``count`` per category, largest amount first."""
+    category = expenses['category'].cat
+    codes = category.codes.to_numpy()
+    present = codes >= 0
+    codes = codes[present]
+    amounts = expenses['abs_amount'].to_numpy()[present]
+
+    # One pass over the integer codes instead of hashing every category string
+    totals, counts = aggregate_by_category(codes, amounts, len(category.categories))
+    return _category_table(category.categories, totals, counts)
+
+
+def _category_table(categories: pd.Index, totals: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+    """Per-category ``amount`` and ``count`` for the categories with rows, largest amount first."""
+    used = counts > 0
+    return (
+        pd.DataFrame({'amount': totals[used], 'count': counts[used]},
+                     index=categories[used].rename('category'))
+        .sort_values('amount', ascending=False, kind='stable')
+    )
+
+
+def category_totals(expenses: pd.DataFrame) -> pd.Series:
+    """Total absolute amount per category, largest first."""
+    return category_summary(expenses)['amount']
+
+
+def expense_summary(frame: pd.DataFrame) -> Dict:
+    """Expense and payment totals, largest expense, expense count and per-category expense totals of ``frame``."""
+    category = frame['category'].cat
+    (total_expenses, total_payments, max_expense, expense_count,
+     totals, counts) = summarize_amounts(frame['amount'].to_numpy(), category.codes.to_numpy(),
+                                         len(category.categories))
+    return {
+        'total_expenses': float(total_expenses),
+        'total_payments': float(total_payments),
+        'max_expense': float(max_expense),
+        'expense_count': int(expense_count),
+        'category_totals': _category_table(category.categories, totals, counts)['amount'],
+    }
+
+
+def top_with_other(totals: pd.Series, limit: int = 12, other_label: str = 'Other') -> pd.Series:
+    """Keep the first ``limit`` entries of a largest-first series and fold the rest into one ``other_label`` entry."""
+    if len(totals) <= limit:
+        return totals
+    rest = pd.Series([totals.iloc[limit:].sum()], index=[other_label])
+    return pd.concat([totals.iloc[:limit], rest])
+
+
+def monthly_totals(expenses: pd.DataFrame) -> pd.Series:
+    """Total absolute amount per calendar month, indexed by ``datetime64[M]`` in date order."""
+    months, totals = aggregate_by_month(
+        expenses['transaction_date'].to_numpy(), expenses['abs_amount'].to_numpy()
+    )
+    return pd.Series(totals, index=months)
+
+
+def monthly_category_totals(expenses: pd.DataFrame, categories) -> pd.DataFrame:
+    """Total absolute amount per calendar month (rows, in date order) for each of ``categories`` (columns)."""
+    selected = expenses[expenses['category'].isin(categories).to_numpy()]
+    table = pd.DataFrame({
+        'month': selected['transaction_date'].to_numpy().astype('datetime64[M]'),
+        'category': selected['category'].array,
+        'amount': selected['abs_amount'].to_numpy(),
+    }).pivot_table(index='month', columns='category', values='amount',
+                   aggfunc='sum', fill_value=0, observed=True)
+    return table.reindex(columns=list(categories), fill_value=0)
+
+
+def daily_totals(expenses: pd.DataFrame) -> pd.Series:
+    """Total absolute amount per calendar day, indexed by ``datetime64[D]`` in date order."""
+    days, inverse = np.unique(day_array(expenses), return_inverse=True)
+    totals = np.bincount(inverse, weights=expenses['abs_amount'].to_numpy(), minlength=len(days))
+    return pd.Series(totals, index=days)
+
+
+def weekday_totals(expenses: pd.DataFrame) -> np.ndarray:
+    """Total absolute amount per weekday, Monday first (7 values)."""
+    # 1970-01-01 was a Thursday, so shifting day numbers by 3 puts Monday at 0
+    weekdays = (day_array(expenses).view('i8') + 3) % 7
+    return np.bincount(weekdays, weights=expenses['abs_amount'].to_numpy(), minlength=7)
+
+
+def months_from_days(daily: pd.Series) -> pd.Series:
+    """Roll per-day totals (as from ``daily_totals``) up into the per-month totals ``monthly_totals`` returns."""
+    months, totals = aggregate_by_month(daily.index.to_numpy(), daily.to_numpy())
+    return pd.Series(totals, index=months)
+
+
+def month_labels(months) -> np.ndarray:
+    """Format ``datetime64[M]`` values as ``YYYY-MM`` labels."""
+    return np.datetime_as_string(np.asarray(months, dtype='datetime64[M]'), unit='M')
+
+
+def _truncate(values: pd.Series, width: int) -> pd.Series:
+    """Shorten strings longer than ``width`` and mark them with an ellipsis."""
+    return values.where(values.str.len() <= width, values.str.slice(0, width) + '...')
+
+
+def to_display_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Format frame rows the way the transaction tables show them."""
+    if frame.empty:
+        return pd.DataFrame(columns=DISPLAY_COLUMNS)
+
+    memo = frame['memo'].fillna('')
+    display = pd.DataFrame({
+        'Select': False,
+        'ID': frame['id'].to_numpy(),
+        'Date': frame['transaction_date'].dt.date.to_numpy(),
+        'Description': _truncate(frame['description'], 60).to_numpy(),
+        # Categorical columns ship to the browser as small integer codes plus a dictionary
+        'Category': frame['category'].array,
+        'Type': pd.Categorical(frame['transaction_type'].to_numpy(dtype=object)),
+        'Amount': frame['amount'].to_numpy(),
+        'Memo': _truncate(memo, 30).to_numpy(),
+    })
+    # Built in DISPLAY_COLUMNS order, so no reordering copy is needed
+    return display
+
+
+def format_amounts(amounts: pd.Series) -> pd.Series:
+    """Format amounts with two decimals (like ``f"{x:.2f}"``) without a per-row format call."""
+    values = amounts.to_numpy(dtype=float)
+    cents = pd.Series(np.rint(np.abs(values) * 100).astype(np.int64), index=amounts.index)
+    sign = pd.Series(np.where(values < 0, '-', ''), index=amounts.index, dtype=object)
+    return sign + (cents // 100).astype(str) + '.' + (cents % 100).astype(str).str.zfill(2)
+
+
+def transaction_labels(frame: pd.DataFrame) -> List[str]:
+    """Build the ``date - description - $amount`` labels used by transaction pickers."""
+    if frame.empty:
+        return []
+
+    dates = np.datetime_as_string(frame['transaction_date'].to_numpy().astype('datetime64[D]'))
+    labels = (
+        pd.Series(dates, index=frame.index) + ' - ' +
+        frame['description'].str.slice(0, 50) + ' - $' +
+        format_amounts(frame['amount'])
+    )
+    return labels.tolist()
@@ -1,9 +1,16 @@
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
 
+def content_hash(transaction_date: str, amount: float, description: str) -> str:
+    """Duplicate-detection key from the ISO transaction date, amount and case-insensitive description."""
+    key = f"{transaction_date}|{float(amount)!r}|{description.lower()}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
 @dataclass
 class Transaction:
     """Represents a financial transaction from a credit card statement."""
@@ -55,6 +62,10 @@ class Transaction:
             memo=data.get('memo')
         )
     
+    def content_hash(self) -> str:
+        """Key shared by transactions that duplicate detection treats as the same."""
+        return content_hash(self.transaction_date.isoformat(), self.amount, self.description)
+    
     def is_expense(self) -> bool:
         """Check if this transaction is an expense (negative amount)."""
         return self.amount < 0
@@ -1,9 +1,11 @@
 """Performance monitoring and optimization utilities."""
 
+import sys
 import time
 import logging
 from functools import wraps
 from typing import Any, Callable, Dict
+import pandas as pd
 import streamlit as st
 
 
@@ -90,6 +92,22 @@ class StreamlitCache:
         db = DatabaseManager(db_path)
         return db.get_transaction_count()
     
+    @staticmethod
+    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    def get_cached_expense_payment_counts(db_path: str) -> tuple:
+        """Cache expense and payment counts for better performance."""
+        from app.db import DatabaseManager
+        db = DatabaseManager(db_path)
+        return db.get_expense_payment_counts()
+    
+    @staticmethod
+    def clear_data_cache():
+        """Clear cached database lookups after transactions or categories change."""
+        StreamlitCache.get_cached_category_stats.clear()
+        StreamlitCache.get_cached_categories.clear()
+        StreamlitCache.get_cached_transaction_count.clear()
+        StreamlitCache.get_cached_expense_payment_counts.clear()
+    
     @staticmethod
     def clear_all_cache():
         """Clear all Streamlit cache."""
@@ -128,8 +146,8 @@ def show_performance_metrics():
                 st.success("✅ This operation is performing well")
 
 
-def optimize_large_dataset_display(data: list, page_size: int = 50) -> tuple:
-    """Optimize display of large datasets with pagination."""
+def optimize_large_dataset_display(data, page_size: int = 50) -> tuple:
+    """Optimize display of large datasets with pagination (lists, arrays or DataFrames)."""
     total_items = len(data)
     
     if total_items <= page_size:
@@ -151,7 +169,9 @@ def optimize_large_dataset_display(data: list, page_size: int = 50) -> tuple:
     start_idx = (current_page - 1) * page_size
     end_idx = min(start_idx + page_size, total_items)
     
-    # Return paginated data
+    # Return paginated data; DataFrames are sliced by position, which does not copy the rows
+    if isinstance(data, pd.DataFrame):
+        return data.iloc[start_idx:end_idx], current_page, total_pages
     return data[start_idx:end_idx], current_page, total_pages
 
 
@@ -193,4 +213,19 @@ def optimize_chart_data(data: list, max_points: int = 1000) -> list:
     
     # Sample data points for better performance
     step = len(data) // max_points
-    return data[::step]
\ No newline at end of file
+    return data[::step]
+
+
+def estimate_list_memory(items: list, sample_size: int = 100) -> int:
+    """Approximate bytes held by a list of flat objects, extrapolated from a sample of its items."""
+    sample = items[:sample_size]
+    if not sample:
+        return sys.getsizeof(items)
+
+    # Each object plus its attribute dict and attribute values; nested containers are not followed
+    sample_bytes = 0
+    for item in sample:
+        attributes = getattr(item, '__dict__', {})
+        sample_bytes += sys.getsizeof(item) + sys.getsizeof(attributes)
+        sample_bytes += sum(sys.getsizeof(value) for value in attributes.values())
+    return sys.getsizeof(items) + sample_bytes * len(items) // len(sample)
@@ -1,21 +1,152 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
 from datetime import datetime, timedelta
+from io import BytesIO
+from itertools import compress, islice
+from pathlib import Path
 from typing import List, Optional
+import hashlib
 import logging
-import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
 
 from app.db import DatabaseManager
 from app.csv_parser import CSVParser
 from app.models import Transaction
-from app.export_import import DataExporter, DataImporter, create_download_link
-from app.performance import perf_monitor, StreamlitCache, show_performance_metrics, optimize_large_dataset_display, show_pagination_controls, optimize_chart_data
+from app.frames import (
+    transactions_to_frame, to_display_frame, transaction_labels, format_amounts, day_array, date_range_bounds,
+    category_summary, category_totals, monthly_totals, monthly_category_totals, daily_totals, months_from_days,
+    weekday_totals, month_labels, filter_mask, add_search_columns, search_mask, sort_order, top_with_other,
+    keyword_matches, expense_summary, TEXT_DTYPE
+)
+from app.export_import import DataExporter, DataImporter, create_download_link, dumps_json
+from app.performance import perf_monitor, StreamlitCache, show_performance_metrics, optimize_large_dataset_display, show_pagination_controls, optimize_chart_data, estimate_list_memory
 from app.error_handling import error_handler, safe_operation, ProgressTracker, show_success_message, show_warning_message, validate_user_input
 from app.version import __version__
 
 
+# Above this many rows the single-transaction editor picks by position instead of a dropdown
+MAX_PICKER_OPTIONS = 500
+
+# Transactions written per executemany/commit when importing, with a progress update in between
+IMPORT_BATCH_SIZE = 1000
+
+# Common categorization patterns for auto-categorize; a description takes the first category with a matching keyword
+AUTO_CATEGORY_PATTERNS = {
+    'Groceries': ['grocery', 'supermarket', 'food', 'market', 'kroger', 'walmart', 'target'],
+    'Gas': ['gas', 'fuel', 'shell', 'exxon', 'bp', 'chevron', 'mobil'],
+    'Restaurants': ['restaurant', 'cafe', 'coffee', 'starbucks', 'mcdonald', 'subway', 'pizza'],
+    'Shopping': ['amazon', 'ebay', 'store', 'shop', 'retail', 'mall'],
+    'Utilities': ['electric', 'water', 'gas bill', 'internet', 'phone', 'cable'],
+    'Transportation': ['uber', 'lyft', 'taxi', 'bus', 'train', 'parking'],
+    'Entertainment': ['movie', 'theater', 'netflix', 'spotify', 'game', 'entertainment'],
+    'Healthcare': ['medical', 'doctor', 'pharmacy', 'hospital', 'health', 'dental']
+}
+
+# Line charts with more points than this per trace render with WebGL; smaller ones stay SVG, which is crisper
+WEBGL_MIN_POINTS = 200
+
+# Weekday labels in the order of weekday_totals (Monday first)
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Generated export files live here until cleared, regenerated or older than EXPORT_MAX_AGE_SECONDS
+EXPORT_DIR = Path(tempfile.gettempdir()) / "expense_tracker_exports"
+EXPORT_MAX_AGE_SECONDS = 24 * 60 * 60
+
+
+def _remove_stale_exports(max_age_seconds: float = EXPORT_MAX_AGE_SECONDS):
+    """Delete export files older than ``max_age_seconds``, left behind by sessions that ended without clearing them."""
+    cutoff = datetime.now().timestamp() - max_age_seconds
+    for path in EXPORT_DIR.glob('export_*'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass  # Removed meanwhile by another session
+
+
+@st.cache_resource(show_spinner=False)
+def _prepare_export_dir() -> Path:
+    """Create the export directory and empty it of files from earlier runs of the app (once per process)."""
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    _remove_stale_exports(max_age_seconds=0)
+    return EXPORT_DIR
+
+
+# Figures for small aggregated charts, keyed by their plotted values. Reruns that plot the same values
+# reuse the built figure instead of constructing and validating it again; the figures are read-only.
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _amount_histogram_figure(counts: tuple, edges: tuple) -> go.Figure:
+    """Histogram of pre-binned amounts (``edges`` has one more value than ``counts``)."""
+    edges = np.asarray(edges)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate='Amount Range: $%{customdata[0]:.2f} - $%{customdata[1]:.2f}'
+                      '<br>Transactions: %{y}<extra></extra>'
+    ))
+    fig.update_layout(
+        title="Transaction Amount Distribution",
+        xaxis_title="Amount ($)",
+        yaxis_title="Number of Transactions",
+        bargap=0,
+        height=400
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _weekday_figure(day_spending: tuple) -> go.Figure:
+    """Bar chart of spending per weekday, Monday first."""
+    fig = px.bar(
+        x=DAY_NAMES,
+        y=day_spending,
+        title="Spending by Day of Week",
+        labels={'x': 'Day of Week', 'y': 'Amount ($)'},
+        color=day_spending,
+        color_continuous_scale='Blues'
+    )
+    fig.update_traces(
+        hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
+    )
+    fig.update_layout(height=400, coloraxis_showscale=False)
+    return fig
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _monthly_payments_figure(months: tuple, amounts: tuple) -> go.Figure:
+    """Bar chart of payment totals per month label, shaded by amount."""
+    values = np.asarray(amounts, dtype=float)
+    spread = np.ptp(values) if len(values) else 0
+    shade = (values - values.min()) / spread if spread else np.full(len(values), 0.5)
+    # Colours are resolved here once rather than through a colour axis the browser maps per bar
+    colors = sample_colorscale('Greens', shade.tolist())
+    hovertemplate = '<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
+
+    if len(values) > WEBGL_MIN_POINTS:
+        trace = go.Scattergl(x=months, y=values, mode='markers', marker=dict(color=colors),
+                             hovertemplate=hovertemplate)
+    else:
+        trace = go.Bar(x=months, y=values, marker_color=colors, hovertemplate=hovertemplate)
+    fig = go.Figure(trace)
+    fig.update_layout(
+        title="Monthly Payments",
+        xaxis_title="Month",
+        yaxis_title="Amount ($)",
+        height=400
+    )
+    return fig
+
+
 class ExpenseTrackerUI:
     """Main UI class for the expense tracker application."""
     
@@ -23,14 +154,30 @@ class ExpenseTrackerUI:
         self.logger = logging.getLogger(__name__)
         self.db = DatabaseManager()
         self.csv_parser = CSVParser()
+        # The first page served by this process removes exports left by earlier runs
+        _prepare_export_dir()
         
         # Initialize session state
         if 'transactions' not in st.session_state:
             st.session_state.transactions = []
         if 'filtered_transactions' not in st.session_state:
             st.session_state.filtered_transactions = []
+        if 'data_version' not in st.session_state:
+            st.session_state.data_version = 0
+        if 'transactions_df' not in st.session_state:
+            self._set_transaction_frame([])
         if 'categories' not in st.session_state:
-            st.session_state.categories = []
+            self._set_categories([])
+        if 'frame_memo' not in st.session_state:
+            # ((data version, transaction ids), frame) for the most recently converted list
+            st.session_state.frame_memo = None
+        if 'display_memo' not in st.session_state:
+            # Same key as frame_memo, with the formatted display frame built from it
+            st.session_state.display_memo = None
+        if 'upload_memo' not in st.session_state:
+            # ((content hash, format, data version), (csv frame, transactions, duplicate analysis))
+            # for the uploaded file, so widget reruns on the upload page skip re-parsing it
+            st.session_state.upload_memo = None
     
     def run(self):
         """Main application entry point."""
@@ -73,6 +220,19 @@ class ExpenseTrackerUI:
     def _load_data(self):
         """Load transactions and categories from database with performance optimization."""
         try:
+            db_token = self.db.change_token()
+            if st.session_state.get('loaded_data_version') == st.session_state.data_version:
+                if st.session_state.get('loaded_db_token') == db_token:
+                    # Nothing was written since the last load: reuse the in-memory data
+                    st.session_state.filtered_transactions = st.session_state.transactions
+                    st.session_state.filtered_df = st.session_state.transactions_df
+                    st.session_state.filter_key = (st.session_state.data_version, None)
+                    st.session_state.filter_state = None
+                    return
+                
+                # Another session or process wrote to the database: drop cached lookups and memos
+                self._invalidate_data()
+            
             # Use cached data when possible
             transaction_count = StreamlitCache.get_cached_transaction_count(self.db.db_path)
             
@@ -85,16 +245,75 @@ class ExpenseTrackerUI:
                 st.session_state.large_dataset = False
             
             # Use cached categories
-            st.session_state.categories = StreamlitCache.get_cached_categories(self.db.db_path)
+            self._set_categories(StreamlitCache.get_cached_categories(self.db.db_path))
             st.session_state.filtered_transactions = st.session_state.transactions
             
+            self._set_transaction_frame(st.session_state.transactions)
+            
             # Store performance info
             st.session_state.total_transaction_count = transaction_count
+            st.session_state.loaded_data_version = st.session_state.data_version
+            st.session_state.loaded_db_token = db_token
             
         except Exception as e:
             self.logger.error(f"Failed to load data: {e}")
             st.error(f"Failed to load data: {e}")
     
+    def _set_transaction_frame(self, transactions: List[Transaction]):
+        """Store a columnar copy aligned row-for-row with the newest-first transaction list."""
+        frame = transactions_to_frame(transactions)
+        if not frame['transaction_date'].is_monotonic_decreasing:
+            # Date-range filtering relies on newest-first order
+            transactions.sort(key=lambda t: t.transaction_date, reverse=True)
+            frame = transactions_to_frame(transactions)
+        add_search_columns(frame)
+        
+        days = day_array(frame)
+        st.session_state.transactions_df = frame
+        st.session_state.transaction_days = days
+        # Row position of each transaction id, so lists of loaded transactions map back to frame rows
+        st.session_state.transaction_index = pd.Index(frame['id'].to_numpy())
+        st.session_state.filtered_df = frame
+        st.session_state.filter_key = (st.session_state.data_version, None)
+        st.session_state.filter_state = None
+        # (earliest, latest) transaction dates and (smallest, largest) absolute amounts, read by the
+        # filter widgets on every rerun
+        st.session_state.date_bounds = (days[-1].item(), days[0].item()) if len(days) else None
+        abs_amounts = frame['abs_amount'].to_numpy()
+        st.session_state.amount_bounds = (
+            (float(abs_amounts.min()), float(abs_amounts.max())) if len(abs_amounts) else None
+        )
+    
+    def _invalidate_data(self):
+        """Mark loaded data as stale so the next _load_data re-reads the database."""
+        StreamlitCache.clear_data_cache()
+        st.session_state.data_version += 1
+    
+    @staticmethod
+    def _set_categories(categories: List[str]):
+        """Store the category list along with a lookup of each category's position in it."""
+        st.session_state.categories = categories
+        st.session_state.category_index = {category: i for i, category in enumerate(categories)}
+    
+    def _apply_category_locally(self, transaction_ids: List[int], new_category: str):
+        """Patch categories of loaded transactions in place instead of reloading everything."""
+        frame = st.session_state.transactions_df
+        positions = np.flatnonzero(frame['id'].isin(list(transaction_ids)).to_numpy())
+        for position in positions:
+            st.session_state.transactions[position].category = new_category
+        if new_category not in frame['category'].cat.categories:
+            frame['category'] = frame['category'].cat.add_categories([new_category])
+        frame.loc[positions, 'category'] = new_category
+        
+        if new_category not in st.session_state.category_index:
+            self._set_categories(sorted(st.session_state.categories + [new_category]))
+        
+        # The in-memory copy already reflects the change, so keep it current
+        StreamlitCache.clear_data_cache()
+        st.session_state.data_version += 1
+        st.session_state.loaded_data_version = st.session_state.data_version
+        st.session_state.loaded_db_token = self.db.change_token()
+    
     def _show_dashboard(self):
         """Display the main dashboard with summary statistics."""
         st.header("Dashboard")
@@ -116,16 +335,14 @@ class ExpenseTrackerUI:
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
         
-        total_transactions = len(transactions_to_show)
-        expenses = [t for t in transactions_to_show if t.is_expense()]
-        payments = [t for t in transactions_to_show if t.is_payment()]
-        
-        total_expenses = sum(abs(t.amount) for t in expenses)
-        total_payments = sum(t.amount for t in payments)
-        net_amount = sum(t.amount for t in transactions_to_show)
+        stats = self._filter_memo('dashboard_memo', self._dashboard_stats)
+        expense_count = stats['expense_count']
+        total_expenses = stats['total_expenses']
+        total_payments = stats['total_payments']
+        net_amount = stats['net_amount']
         
         with col1:
-            st.metric("Transactions", total_transactions)
+            st.metric("Transactions", stats['transactions'])
         with col2:
             st.metric("Total Expenses", f"${total_expenses:.2f}")
         with col3:
@@ -134,71 +351,122 @@ class ExpenseTrackerUI:
             st.metric("Net Amount", f"${net_amount:.2f}")
         
         # Additional metrics row
-        if expenses:
+        if expense_count:
             col1, col2, col3, col4 = st.columns(4)
             
-            avg_expense = total_expenses / len(expenses) if expenses else 0
-            max_expense = max(abs(t.amount) for t in expenses) if expenses else 0
-            expense_categories = len(set(t.category for t in expenses))
-            
             with col1:
-                st.metric("Avg Expense", f"${avg_expense:.2f}")
+                st.metric("Avg Expense", f"${total_expenses / expense_count:.2f}")
             with col2:
-                st.metric("Largest Expense", f"${max_expense:.2f}")
+                st.metric("Largest Expense", f"${stats['max_expense']:.2f}")
             with col3:
-                st.metric("Categories", expense_categories)
+                st.metric("Categories", len(stats['category_totals']))
             with col4:
-                if len(transactions_to_show) > 0:
-                    date_range_days = (max(t.transaction_date for t in transactions_to_show) - 
-                                     min(t.transaction_date for t in transactions_to_show)).days + 1
-                    st.metric("Date Range", f"{date_range_days} days")
+                st.metric("Date Range", f"{stats['date_range_days']} days")
         
         # Recent transactions
         st.subheader("Recent Transactions")
-        recent_transactions = sorted(transactions_to_show, key=lambda t: t.transaction_date, reverse=True)[:10]
-        if recent_transactions:
-            df = self._transactions_to_dataframe(recent_transactions)
+        # Rows are kept newest-first, so the most recent ones are simply the head
+        recent = st.session_state.filtered_df.head(10)
+        if not recent.empty:
             # Remove Select and ID columns for dashboard display
-            display_df = df.drop(columns=['Select', 'ID'])
+            display_df = to_display_frame(recent).drop(columns=['Select', 'ID'])
             st.dataframe(display_df, use_container_width=True)
         
         # Quick category breakdown
-        if expenses:
+        if expense_count:
             st.subheader("Expense Categories")
-            category_data = {}
-            for t in expenses:
-                category_data[t.category] = category_data.get(t.category, 0) + abs(t.amount)
+            totals = stats['category_totals']
             
-            if category_data:
-                # Sort categories by amount
-                sorted_categories = sorted(category_data.items(), key=lambda x: x[1], reverse=True)
-                
+            if not totals.empty:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    fig = px.pie(
-                        values=[item[1] for item in sorted_categories],
-                        names=[item[0] for item in sorted_categories],
-                        title="Spending by Category"
+                    # Horizontal bars, largest on top; categories past the 15th share one "Other" bar
+                    bar_totals = top_with_other(totals, limit=15)
+                    fig = go.Figure(go.Bar(
+                        x=bar_totals.to_numpy(),
+                        y=bar_totals.index.to_numpy(),
+                        orientation='h',
+                        hovertemplate='<b>%{y}</b><br>Amount: $%{x:.2f}<extra></extra>'
+                    ))
+                    fig.update_layout(
+                        title="Spending by Category",
+                        xaxis_title="Amount ($)",
+                        yaxis=dict(autorange='reversed')
                     )
                     st.plotly_chart(fig, use_container_width=True)
                 
                 with col2:
                     # Top categories table
                     st.write("**Top Categories**")
-                    top_categories = sorted_categories[:8]
-                    for category, amount in top_categories:
-                        percentage = (amount / total_expenses) * 100
-                        st.write(f"• **{category}**: ${amount:.2f} ({percentage:.1f}%)")
+                    top_categories = totals.head(8)
+                    # One markdown element, with a hard line break between entries
+                    st.markdown("  \n".join(
+                        f"• **{category}**: ${amount:.2f} ({amount / total_expenses * 100:.1f}%)"
+                        for category, amount in top_categories.items()
+                    ))
         
         # Monthly spending trend (if data spans multiple months)
-        if expenses and len(transactions_to_show) > 0:
-            date_range_days = (max(t.transaction_date for t in transactions_to_show) - 
-                             min(t.transaction_date for t in transactions_to_show)).days
-            
-            if date_range_days > 30:  # Show trend if more than 30 days of data
-                st.subheader("Spending Trend")
-                self._show_spending_timeline(expenses)
+        # date_range_days counts both end days, so more than 30 days between them is more than 31
+        if expense_count and stats['date_range_days'] > 31:
+            st.subheader("Spending Trend")
+            self._show_spending_timeline(stats['monthly'])
+    
+    @staticmethod
+    def _filter_memo(name: str, build):
+        """Return ``build()`` for the current filtered rows, reusing the result stored under ``name`` while they are unchanged."""
+        key = st.session_state.filter_key
+        memo = st.session_state.get(name)
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        
+        value = build()
+        st.session_state[name] = (key, value)
+        return value
+    
+    @staticmethod
+    def _memo_figure(name, build):
+        """Return the chart ``name`` for the current filtered rows, calling ``build()`` only after they change.
+        
+        Widget reruns that leave the filters alone (expanders, export options) then skip rebuilding figures.
+        """
+        figures = ExpenseTrackerUI._filter_memo('figure_memo', dict)
+        if name not in figures:
+            figures[name] = build()
+        return figures[name]
+    
+    def _dashboard_stats(self) -> dict:
+        """Summary figures for the dashboard over the filtered rows."""
+        if st.session_state.get('large_dataset', False):
+            return self._database_dashboard_stats()
+        
+        frame = st.session_state.filtered_df
+        first_date, last_date = frame['transaction_date'].agg(['min', 'max'])
+        # Totals, largest expense and per-category sums come from a single pass over the amounts; only
+        # categories with expenses appear in category_totals, so its length is the distinct category count
+        stats = expense_summary(frame)
+        
+        stats.update({
+            'transactions': len(frame),
+            'net_amount': stats['total_payments'] - stats['total_expenses'],
+            'date_range_days': (last_date - first_date).days + 1,
+            'monthly': monthly_totals(frame[frame['is_expense'].to_numpy()]),
+        })
+        return stats
+    
+    def _database_dashboard_stats(self) -> dict:
+        """``_dashboard_stats`` figures over every stored transaction, for datasets only partly loaded."""
+        stats = self.db.get_aggregate_stats(**(st.session_state.filter_state or {}))
+        
+        first_date, last_date = stats.pop('first_date'), stats.pop('last_date')
+        stats['date_range_days'] = (last_date.date() - first_date.date()).days + 1 if first_date else 0
+        totals = stats['category_totals']
+        stats['category_totals'] = pd.Series(
+            list(totals.values()), index=pd.Index(list(totals.keys()), name='category'), dtype=float
+        ).sort_values(ascending=False, kind='stable')
+        months, amounts = zip(*stats['monthly']) if stats['monthly'] else ((), ())
+        stats['monthly'] = pd.Series(amounts, index=np.array(months, dtype='datetime64[M]'), dtype=float)
+        return stats
     
     def _show_upload_page(self):
         """Display the CSV upload page."""
@@ -239,10 +507,13 @@ class ExpenseTrackerUI:
                 help="Select format or use auto-detection"
             )
         
-        if uploaded_file is not None:
+        if uploaded_file is None:
+            st.session_state.upload_memo = None
+        else:
             try:
-                # Read file content
-                csv_content = uploaded_file.read().decode('utf-8')
+                # Work on the upload's bytes without decoding them into one large string
+                raw_content = uploaded_file.getvalue()
+                csv_content = BytesIO(raw_content)
                 
                 # Determine format
                 if selected_format == "Auto-detect":
@@ -317,15 +588,24 @@ class ExpenseTrackerUI:
                             st.warning(f"**Extra columns:** {', '.join(validation_result['extra_columns'])}")
                         
                         return
-                    return
+                
+                # Parsing and the duplicate lookups run once per file and format; the duplicate
+                # analysis also depends on what is already stored, hence the data version
+                upload_key = (hashlib.sha256(raw_content).hexdigest(), format_to_use, st.session_state.data_version)
+                memo = st.session_state.upload_memo
+                if memo is not None and memo[0] == upload_key:
+                    csv_frame, transactions, duplicate_analysis = memo[1]
+                else:
+                    # Read the file once; the preview is the head of the parsed frame
+                    csv_frame = self.csv_parser.read_csv_frame(csv_content, format_to_use)
+                    transactions = self.csv_parser.parse_dataframe(csv_frame, format_to_use)
+                    # Enhanced duplicate detection with options
+                    duplicate_analysis = self._analyze_duplicates(transactions) if transactions else None
+                    st.session_state.upload_memo = (upload_key, (csv_frame, transactions, duplicate_analysis))
                 
                 # Show preview
                 st.subheader("📋 Preview")
-                preview_df = self.csv_parser.get_csv_preview(csv_content)
-                st.dataframe(preview_df, use_container_width=True)
-                
-                # Parse transactions
-                transactions = self.csv_parser.parse_csv_generic(csv_content, format_to_use)
+                st.dataframe(csv_frame.head(5), use_container_width=True)
                 
                 if not transactions:
                     st.warning("No valid transactions found in the CSV file.")
@@ -333,9 +613,6 @@ class ExpenseTrackerUI:
                 
                 st.success(f"Found {len(transactions)} transactions")
                 
-                # Enhanced duplicate detection with options
-                duplicate_analysis = self._analyze_duplicates(transactions)
-                
                 # Show duplicate analysis results
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -413,15 +690,18 @@ class ExpenseTrackerUI:
         self._show_filters()
         
         transactions = st.session_state.filtered_transactions
-        expenses = [t for t in transactions if t.is_expense()]
-        payments = [t for t in transactions if t.is_payment()]
+        frame = st.session_state.filtered_df
         
         if not transactions:
             st.warning("No transactions match the current filters.")
             return
         
+        analysis = self._filter_memo('analysis_memo', self._analysis_data)
+        expenses = analysis['expenses']
+        payments = analysis['payments']
+        
         # Analytics summary
-        self._show_analytics_summary(transactions, expenses, payments)
+        self._show_analytics_summary(frame)
         
         # Chart export controls
         st.subheader("📊 Visualizations")
@@ -436,26 +716,54 @@ class ExpenseTrackerUI:
                 self._export_charts(expenses, chart_format)
         
         # Enhanced visualizations
-        if expenses:
+        if not expenses.empty:
             # Category analysis
             st.subheader("💰 Spending by Category")
-            self._show_enhanced_category_charts(expenses)
+            self._show_enhanced_category_charts(expenses, analysis['summary'])
             
             # Sankey diagram
             st.subheader("🌊 Money Flow Analysis (Sankey Diagram)")
-            self._show_sankey_diagram(transactions)
+            self._show_sankey_diagram(frame)
             
             # Time-based analysis
             st.subheader("📅 Spending Trends")
-            self._show_enhanced_timeline_charts(expenses)
+            self._show_enhanced_timeline_charts(analysis)
             
             # Transaction analysis
             st.subheader("🔍 Transaction Analysis")
-            self._show_transaction_analysis_charts(expenses)
+            self._show_transaction_analysis_charts(analysis)
         
-        if payments:
+        if not payments.empty:
             st.subheader("💳 Payment Analysis")
-            self._show_payment_analysis(payments)
+            self._show_payment_analysis(analysis)
+    
+    @staticmethod
+    def _analysis_data() -> dict:
+        """Rows and aggregates behind the analytics charts for the filtered rows."""
+        frame = st.session_state.filtered_df
+        # Expense and payment rows, selected once and shared by every chart
+        expenses = frame[frame['is_expense'].to_numpy()]
+        payments = frame[frame['is_payment'].to_numpy()]
+        # Per-category totals, shared by the category and trend charts
+        summary = category_summary(expenses)
+        # One pass over the rows; months are summed from the far fewer daily totals
+        daily = daily_totals(expenses)
+        monthly = months_from_days(daily)
+        
+        return {
+            'expenses': expenses,
+            'payments': payments,
+            'summary': summary,
+            'daily': daily,
+            'monthly': monthly,
+            # Months of the five largest categories, aligned with the overall months
+            'category_monthly': monthly_category_totals(expenses, summary.index[:5]).reindex(
+                monthly.index, fill_value=0
+            ),
+            'histogram': np.histogram(expenses['abs_amount'].to_numpy(), bins=20),
+            'weekday': weekday_totals(expenses),
+            'payment_monthly': monthly_totals(payments),
+        }
     
     def _show_filters(self):
         """Display enhanced filter controls with date presets."""
@@ -467,9 +775,8 @@ class ExpenseTrackerUI:
             
             # Get date bounds from transactions
             try:
-                min_date = min(t.transaction_date for t in st.session_state.transactions).date()
-                max_date = max(t.transaction_date for t in st.session_state.transactions).date()
-            except (ValueError, AttributeError) as e:
+                min_date, max_date = st.session_state.date_bounds
+            except (ValueError, TypeError) as e:
                 st.error("Error getting date range from transactions. Please reload the data.")
                 self.logger.error(f"Date range error: {e}")
                 return
@@ -589,8 +896,7 @@ class ExpenseTrackerUI:
             with col3:
                 # Amount range filter
                 if st.session_state.transactions:
-                    amounts = [abs(t.amount) for t in st.session_state.transactions]
-                    min_amount, max_amount = min(amounts), max(amounts)
+                    min_amount, max_amount = st.session_state.amount_bounds
                     
                     st.write("**Amount Range ($)**")
                     col1, col2 = st.columns(2)
@@ -602,7 +908,8 @@ class ExpenseTrackerUI:
                             max_value=float(max_amount),
                             value=0.0,
                             step=1.0,
-                            key="min_amount_input"
+                            key="min_amount_input",
+                            on_change=self._sync_amount_slider
                         )
                     
                     with col2:
@@ -612,7 +919,8 @@ class ExpenseTrackerUI:
                             max_value=float(max_amount),
                             value=float(max_amount),
                             step=1.0,
-                            key="max_amount_input"
+                            key="max_amount_input",
+                            on_change=self._sync_amount_slider
                         )
                     
                     # Also provide slider for convenience
@@ -622,40 +930,52 @@ class ExpenseTrackerUI:
                         max_value=float(max_amount),
                         value=(min_amt_input, max_amt_input),
                         step=1.0,
-                        key="amount_filter_slider"
+                        key="amount_filter_slider",
+                        on_change=self._sync_amount_inputs
                     )
-                    
-                    # Use manual inputs if they differ from slider, otherwise use slider
-                    if (min_amt_input, max_amt_input) != amount_range:
-                        amount_range = (min_amt_input, max_amt_input)
-                    else:
-                        # Update number inputs to match slider
-                        st.session_state.min_amount_input = amount_range[0]
-                        st.session_state.max_amount_input = amount_range[1]
             
             # Apply filters
-            filtered = st.session_state.transactions
-            
-            # Date filter
-            filtered = [t for t in filtered 
-                       if start_date <= t.transaction_date.date() <= end_date]
-            
-            # Category filter
-            if selected_category != "All":
-                filtered = [t for t in filtered if t.category == selected_category]
-            
-            # Type filter
-            if selected_type == "Expenses Only":
-                filtered = [t for t in filtered if t.is_expense()]
-            elif selected_type == "Payments Only":
-                filtered = [t for t in filtered if t.is_payment()]
+            # Date filter: rows are newest-first, so the range is one contiguous slice
+            lo, hi = date_range_bounds(st.session_state.transaction_days, start_date, end_date)
+            # Identifies the filtered rows: same data version and filter values give the same rows
+            filter_key = (
+                st.session_state.data_version, lo, hi, selected_category, selected_type, tuple(amount_range)
+            )
             
-            # Amount filter
-            if st.session_state.transactions:
-                min_amt, max_amt = amount_range
-                filtered = [t for t in filtered if min_amt <= abs(t.amount) <= max_amt]
+            memo = st.session_state.get('filter_result_memo')
+            if memo is not None and memo[0] == filter_key:
+                # Filters unchanged since the last rerun: reuse its rows
+                filtered, filtered_df = memo[1]
+            else:
+                date_slice = st.session_state.transactions_df.iloc[lo:hi]
+                
+                # Category, type and amount filters combined into a single mask over the slice
+                mask = filter_mask(
+                    date_slice,
+                    category=None if selected_category == "All" else selected_category,
+                    expenses_only=selected_type == "Expenses Only",
+                    payments_only=selected_type == "Payments Only",
+                    amount_range=amount_range if st.session_state.transactions else None
+                )
+                
+                filtered = list(compress(st.session_state.transactions[lo:hi], mask))
+                filtered_df = date_slice[mask]
+                st.session_state.filter_result_memo = (filter_key, (filtered, filtered_df))
             
             st.session_state.filtered_transactions = filtered
+            st.session_state.filtered_df = filtered_df
+            st.session_state.filter_key = filter_key
+            # The same filters as database arguments. Large datasets load only the newest rows, so a range
+            # reaching the oldest loaded date or the largest loaded amount is left open-ended there
+            st.session_state.filter_state = {
+                'start_date': None if start_date <= min_date else start_date,
+                'end_date': None if end_date >= max_date else end_date,
+                'category': None if selected_category == "All" else selected_category,
+                'expenses_only': selected_type == "Expenses Only",
+                'payments_only': selected_type == "Payments Only",
+                'min_amount': amount_range[0] if amount_range[0] > 0 else None,
+                'max_amount': amount_range[1] if amount_range[1] < max_amount else None,
+            }
             
             # Show filter summary
             total_transactions = len(st.session_state.transactions)
@@ -677,6 +997,21 @@ class ExpenseTrackerUI:
             else:
                 st.success(f"Showing all {total_transactions} transactions")
     
+    @staticmethod
+    def _go_to_page(page: int):
+        """Button callback: show the given page of the transactions table."""
+        st.session_state.current_page = page
+    
+    @staticmethod
+    def _sync_amount_inputs():
+        """Copy the amount slider range into the min/max number inputs."""
+        st.session_state.min_amount_input, st.session_state.max_amount_input = st.session_state.amount_filter_slider
+    
+    @staticmethod
+    def _sync_amount_slider():
+        """Copy the min/max number inputs into the amount slider range."""
+        st.session_state.amount_filter_slider = (st.session_state.min_amount_input, st.session_state.max_amount_input)
+    
     @perf_monitor.time_operation("show_transactions_table")
     def _show_transactions_table(self):
         """Display transactions in an enhanced table with search and sorting."""
@@ -741,33 +1076,50 @@ class ExpenseTrackerUI:
                 key="transaction_page_size"
             )
         
-        # Apply search filter
-        if search_term:
-            search_lower = search_term.lower()
-            transactions = [
-                t for t in transactions
-                if (search_lower in t.description.lower() or
-                    search_lower in t.category.lower() or
-                    (t.memo and search_lower in t.memo.lower()))
-            ]
-        
-        # Apply sorting
-        if sort_by == "Date (Newest)":
-            transactions.sort(key=lambda t: t.transaction_date, reverse=True)
-        elif sort_by == "Date (Oldest)":
-            transactions.sort(key=lambda t: t.transaction_date)
-        elif sort_by == "Amount (High to Low)":
-            transactions.sort(key=lambda t: abs(t.amount), reverse=True)
-        elif sort_by == "Amount (Low to High)":
-            transactions.sort(key=lambda t: abs(t.amount))
-        elif sort_by == "Description":
-            transactions.sort(key=lambda t: t.description.lower())
-        elif sort_by == "Category":
-            transactions.sort(key=lambda t: t.category.lower())
+        # Search matches and their sorted order are kept while the filtered rows, search and sort are
+        # unchanged, so page clicks and unrelated widgets only re-slice them
+        frame = st.session_state.filtered_df
+        order_key = (st.session_state.filter_key, search_term, sort_by)
+        memo = st.session_state.get('table_order_memo')
+        if memo is not None and memo[0] == order_key:
+            _, matched, ordered, ordered_limit = memo
+        else:
+            # Apply search filter
+            if search_term:
+                matched = np.flatnonzero(search_mask(frame, search_term))
+            else:
+                matched = np.arange(len(frame))
+            ordered, ordered_limit = None, 0
+        
+        # Apply sorting; rows are already newest-first
+        sort_keys = {
+            "Date (Oldest)": ('date', False),
+            "Amount (High to Low)": ('amount', True),
+            "Amount (Low to High)": ('amount', False),
+            "Description": ('description', False),
+            "Category": ('category', False),
+        }
+        total_transactions = len(matched)
         
-        # Pagination
-        total_transactions = len(transactions)
+        # Rows past the end of the current page never need to be put in order
+        sort_limit = None
+        if page_size != "All":
+            last_page = max(0, (total_transactions - 1) // int(page_size))
+            current_page = min(st.session_state.get('current_page', 0), last_page)
+            sort_limit = (current_page + 1) * int(page_size)
+        
+        if sort_by in sort_keys and len(matched) > 1:
+            # A stored order covering at least sort_limit rows (None: all of them) is reused as is
+            if ordered is None or (ordered_limit is not None and (sort_limit is None or sort_limit > ordered_limit)):
+                key, descending = sort_keys[sort_by]
+                ordered = matched[sort_order(frame.iloc[matched], key, descending, limit=sort_limit)]
+                ordered_limit = sort_limit
+            positions = ordered
+        else:
+            positions = matched
+        st.session_state.table_order_memo = (order_key, matched, ordered, ordered_limit)
         
+        # Pagination
         if page_size != "All":
             page_size = int(page_size)
             
@@ -780,28 +1132,27 @@ class ExpenseTrackerUI:
             if total_pages > 1:
                 col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
                 
+                # Callbacks set the page before the rerun, so no second rerun is needed
+                current_page = st.session_state.current_page
+                
                 with col1:
-                    if st.button("⏮️ First", disabled=st.session_state.current_page == 0):
-                        st.session_state.current_page = 0
-                        st.rerun()
+                    st.button("⏮️ First", disabled=current_page == 0,
+                              on_click=self._go_to_page, args=(0,))
                 
                 with col2:
-                    if st.button("◀️ Prev", disabled=st.session_state.current_page == 0):
-                        st.session_state.current_page -= 1
-                        st.rerun()
+                    st.button("◀️ Prev", disabled=current_page == 0,
+                              on_click=self._go_to_page, args=(current_page - 1,))
                 
                 with col3:
-                    st.write(f"Page {st.session_state.current_page + 1} of {total_pages} ({total_transactions} total)")
+                    st.write(f"Page {current_page + 1} of {total_pages} ({total_transactions} total)")
                 
                 with col4:
-                    if st.button("Next ▶️", disabled=st.session_state.current_page >= total_pages - 1):
-                        st.session_state.current_page += 1
-                        st.rerun()
+                    st.button("Next ▶️", disabled=current_page >= total_pages - 1,
+                              on_click=self._go_to_page, args=(current_page + 1,))
                 
                 with col5:
-                    if st.button("Last ⏭️", disabled=st.session_state.current_page >= total_pages - 1):
-                        st.session_state.current_page = total_pages - 1
-                        st.rerun()
+                    st.button("Last ⏭️", disabled=current_page >= total_pages - 1,
+                              on_click=self._go_to_page, args=(total_pages - 1,))
             
             # Reset page if it's out of bounds
             if st.session_state.current_page >= total_pages:
@@ -810,10 +1161,18 @@ class ExpenseTrackerUI:
             # Get transactions for current page
             start_idx = st.session_state.current_page * page_size
             end_idx = min(start_idx + page_size, total_transactions)
-            transactions = transactions[start_idx:end_idx]
+            positions = positions[start_idx:end_idx]
+        
+        # Only the rows on this page are materialized, straight from the filtered frame
+        transactions = [transactions[i] for i in positions]
+        page_frame = frame.iloc[positions]
         
         # Convert to DataFrame and display
-        df = self._transactions_to_dataframe(transactions)
+        df = to_display_frame(page_frame) if transactions else pd.DataFrame()
+        if not df.empty:
+            # Every option the Category selectbox offers must be a valid value of the categorical column
+            missing = [c for c in st.session_state.categories if c not in df['Category'].cat.categories]
+            df['Category'] = df['Category'].cat.add_categories(missing)
         
         if not df.empty:
             # Add selection column and display with data_editor for row selection
@@ -886,18 +1245,21 @@ class ExpenseTrackerUI:
                             'new_category': new_category
                         })
                 
-                # Apply category changes
+                # Apply category changes, one batch UPDATE per target category
                 if category_changes:
+                    ids_by_category = {}
                     for change in category_changes:
-                        success = self.db.update_transaction_category(change['id'], change['new_category'])
-                        if success:
-                            st.success(f"✅ Updated category for transaction {change['id']} to '{change['new_category']}'")
+                        ids_by_category.setdefault(change['new_category'], []).append(int(change['id']))
+                    
+                    for new_category, ids in ids_by_category.items():
+                        updated = self.db.update_transactions_batch(ids, category=new_category)
+                        if updated:
+                            self._apply_category_locally(ids, new_category)
+                            st.success(f"✅ Updated category for {updated} transaction(s) to '{new_category}'")
                         else:
-                            st.error(f"❌ Failed to update category for transaction {change['id']}")
+                            st.error(f"❌ Failed to update category for transactions {ids}")
                     
-                    # Reload data to reflect changes
-                    self._load_data()
-                    st.experimental_rerun()
+                    st.rerun()
                 
                 # Show selection summary
                 if selected_ids:
@@ -913,29 +1275,41 @@ class ExpenseTrackerUI:
                 tab1, tab2 = st.tabs(["Single Transaction", "Bulk Edit"])
                 
                 with tab1:
-                    self._show_single_category_edit(transactions)
+                    self._show_single_category_edit(transactions, page_frame)
                 
                 with tab2:
-                    self._show_bulk_category_edit(transactions)
+                    self._show_bulk_category_edit(transactions, page_frame)
     
-    def _show_single_category_edit(self, transactions: List[Transaction]):
+    def _show_single_category_edit(self, transactions: List[Transaction], frame: Optional[pd.DataFrame] = None):
         """Show single transaction category editing interface."""
         if not transactions:
             st.info("No transactions available for editing.")
             return
         
         # Select transaction to edit
-        transaction_options = [
-            f"{t.transaction_date.strftime('%Y-%m-%d')} - {t.description[:50]} - ${t.amount:.2f}"
-            for t in transactions
-        ]
-        
-        selected_idx = st.selectbox(
-            "Select transaction to edit",
-            range(len(transaction_options)),
-            format_func=lambda x: transaction_options[x],
-            key="single_edit_select"
-        )
+        if frame is None:
+            frame = self._frame_for(transactions)
+        
+        if len(transactions) > MAX_PICKER_OPTIONS:
+            # Streamlit formats every selectbox option, so pick by position and label just that row
+            position = st.number_input(
+                f"Transaction # (1-{len(transactions)}, in table order)",
+                min_value=1,
+                max_value=len(transactions),
+                value=1,
+                step=1,
+                key="single_edit_position"
+            )
+            selected_idx = int(position) - 1
+            st.caption(transaction_labels(frame.iloc[[selected_idx]])[0])
+        else:
+            transaction_options = transaction_labels(frame)
+            selected_idx = st.selectbox(
+                "Select transaction to edit",
+                range(len(transaction_options)),
+                format_func=transaction_options.__getitem__,
+                key="single_edit_select"
+            )
         
         if selected_idx is not None:
             selected_transaction = transactions[selected_idx]
@@ -948,31 +1322,31 @@ class ExpenseTrackerUI:
                 st.write(f"**Amount:** ${selected_transaction.amount:.2f}")
             
             with col2:
-                # Category selection
-                all_categories = st.session_state.categories + ["Create New..."]
-                
-                if selected_transaction.category in all_categories:
-                    default_idx = all_categories.index(selected_transaction.category)
-                else:
-                    default_idx = 0
-                
-                new_category = st.selectbox(
-                    "New Category",
-                    all_categories,
-                    index=default_idx,
-                    key="single_category_select"
-                )
-                
-                # Handle new category creation
-                if new_category == "Create New...":
-                    new_category = st.text_input("Enter new category name", key="single_new_category")
+                # Category selection inside a form so picking values doesn't rerun the page
+                all_categories = st.session_state.categories
+                default_idx = st.session_state.category_index.get(selected_transaction.category, 0)
+                
+                with st.form("single_category_form"):
+                    new_category = st.selectbox(
+                        "New Category",
+                        all_categories,
+                        index=default_idx,
+                        key="single_category_select"
+                    )
+                    
+                    # Handle new category creation
+                    created_category = st.text_input("Or enter a new category name", key="single_new_category")
+                    
+                    submitted = st.form_submit_button("Update Category", type="primary")
                 
-                if new_category and new_category != "Create New..." and new_category != selected_transaction.category:
-                    if st.button("Update Category", type="primary", key="single_update"):
-                        if self._update_category_safe(selected_transaction.id, new_category):
-                            st.rerun()
+                if submitted:
+                    new_category = created_category.strip() or new_category
+                    if not new_category or new_category == selected_transaction.category:
+                        st.info("Choose a different category to update this transaction.")
+                    elif self._update_category_safe(selected_transaction.id, new_category):
+                        st.rerun()
     
-    def _show_bulk_category_edit(self, transactions: List[Transaction]):
+    def _show_bulk_category_edit(self, transactions: List[Transaction], frame: pd.DataFrame):
         """Show bulk category editing interface."""
         if not transactions:
             st.info("No transactions available for bulk editing.")
@@ -992,32 +1366,36 @@ class ExpenseTrackerUI:
         
         with col2:
             if bulk_method == "By Description Pattern":
-                pattern = st.text_input(
-                    "Description contains (case-insensitive)",
-                    placeholder="e.g., 'AMAZON', 'STARBUCKS'",
-                    key="bulk_pattern"
-                )
+                # Pattern inside a form so the matches are only recomputed when the user asks for a preview
+                with st.form("bulk_pattern_form"):
+                    pattern = st.text_input(
+                        "Description contains (case-insensitive)",
+                        placeholder="e.g., 'AMAZON', 'STARBUCKS'",
+                        key="bulk_pattern"
+                    )
+                    st.form_submit_button("Preview Matches")
                 
                 if pattern:
-                    matching_transactions = [
-                        t for t in transactions
-                        if pattern.lower() in t.description.lower()
-                    ]
-                    st.write(f"Found {len(matching_transactions)} matching transactions")
+                    # Keep only positions; the matching transactions are gathered when the update runs
+                    mask = frame['description_lc'].str.contains(pattern.lower(), regex=False)
+                    matching_positions = np.flatnonzero(mask.to_numpy(dtype=bool))
+                    st.write(f"Found {len(matching_positions)} matching transactions")
                     
-                    if matching_transactions:
+                    if len(matching_positions):
                         # Show preview of matching transactions
-                        preview_df = self._transactions_to_dataframe(matching_transactions[:5])
+                        preview_df = self._transactions_to_dataframe(
+                            [transactions[i] for i in matching_positions[:5]]
+                        )
                         # Remove Select and ID columns for preview
                         display_preview_df = preview_df.drop(columns=['Select', 'ID'])
                         st.write("Preview (showing first 5):")
                         st.dataframe(display_preview_df, use_container_width=True)
                         
-                        if len(matching_transactions) > 5:
-                            st.write(f"... and {len(matching_transactions) - 5} more")
+                        if len(matching_positions) > 5:
+                            st.write(f"... and {len(matching_positions) - 5} more")
             
             else:  # By Current Category
-                current_categories = list(set(t.category for t in transactions))
+                current_categories = frame['category'].drop_duplicates().tolist()
                 selected_category = st.selectbox(
                     "Current category to update",
                     current_categories,
@@ -1025,15 +1403,12 @@ class ExpenseTrackerUI:
                 )
                 
                 if selected_category:
-                    matching_transactions = [
-                        t for t in transactions
-                        if t.category == selected_category
-                    ]
-                    st.write(f"Found {len(matching_transactions)} transactions with category '{selected_category}'")
+                    matching_positions = np.flatnonzero((frame['category'] == selected_category).to_numpy())
+                    st.write(f"Found {len(matching_positions)} transactions with category '{selected_category}'")
         
         # New category selection for bulk update
-        if ((bulk_method == "By Description Pattern" and pattern and matching_transactions) or
-            (bulk_method == "By Current Category" and selected_category and matching_transactions)):
+        if ((bulk_method == "By Description Pattern" and pattern and len(matching_positions)) or
+            (bulk_method == "By Current Category" and selected_category and len(matching_positions))):
             
             st.write("**Select new category:**")
             all_categories = st.session_state.categories + ["Create New..."]
@@ -1051,94 +1426,68 @@ class ExpenseTrackerUI:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.write(f"**Transactions to update:** {len(matching_transactions)}")
+                    st.write(f"**Transactions to update:** {len(matching_positions)}")
                     st.write(f"**New category:** {new_bulk_category}")
                 
                 with col2:
                     if st.button("Update All Selected", type="primary", key="bulk_update"):
+                        matching_transactions = [transactions[i] for i in matching_positions]
                         if self._bulk_update_categories_with_progress(matching_transactions, new_bulk_category):
                             st.rerun()
     
+    @staticmethod
+    def _memo_key(transactions: List[Transaction]) -> tuple:
+        """Key identifying a transaction list at the current data version."""
+        return (st.session_state.data_version, tuple(t.id for t in transactions))
+    
+    def _frame_for(self, transactions: List[Transaction]) -> pd.DataFrame:
+        """Return the frame for a transaction list, reusing it across reruns while the list and data are unchanged."""
+        key = self._memo_key(transactions)
+        
+        memo = st.session_state.frame_memo
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        
+        # Loaded transactions already have rows in the canonical frame; take those instead of rebuilding
+        index = st.session_state.transaction_index
+        positions = index.get_indexer(key[1]) if index.is_unique else None
+        if positions is not None and (positions >= 0).all():
+            frame = st.session_state.transactions_df.iloc[positions].reset_index(drop=True)
+        else:
+            frame = add_search_columns(transactions_to_frame(transactions))
+        st.session_state.frame_memo = (key, frame)
+        return frame
+    
     def _transactions_to_dataframe(self, transactions: List[Transaction]) -> pd.DataFrame:
         """Convert transactions to pandas DataFrame for display."""
         if not transactions:
             return pd.DataFrame()
         
-        data = []
-        for t in transactions:
-            # Format amount with proper sign and color indication
-            amount_display = float(t.amount)
-            
-            data.append({
-                'Select': False,  # Default selection state
-                'ID': t.id,  # Include transaction ID for operations
-                'Date': t.transaction_date.date(),
-                'Description': t.description[:60] + ('...' if len(t.description) > 60 else ''),
-                'Category': t.category,
-                'Type': t.transaction_type,
-                'Amount': amount_display,
-                'Memo': (t.memo[:30] + '...' if t.memo and len(t.memo) > 30 else t.memo) or ""
-            })
-        
-        df = pd.DataFrame(data)
-        
-        # Reorder columns for better display
-        column_order = ['Select', 'ID', 'Date', 'Description', 'Category', 'Type', 'Amount', 'Memo']
-        df = df[column_order]
+        key = self._memo_key(transactions)
+        memo = st.session_state.display_memo
+        if memo is not None and memo[0] == key:
+            return memo[1]
         
-        return df
+        display = to_display_frame(self._frame_for(transactions))
+        st.session_state.display_memo = (key, display)
+        return display
     
-    def _show_category_pie_chart(self, expenses: List[Transaction]):
-        """Display pie chart of expenses by category."""
-        category_totals = {}
-        for t in expenses:
-            category_totals[t.category] = category_totals.get(t.category, 0) + abs(t.amount)
-        
-        if category_totals:
-            fig = px.pie(
-                values=list(category_totals.values()),
-                names=list(category_totals.keys()),
-                title="Expenses by Category (Pie Chart)"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    
-    def _show_category_bar_chart(self, expenses: List[Transaction]):
-        """Display bar chart of expenses by category."""
-        category_totals = {}
-        for t in expenses:
-            category_totals[t.category] = category_totals.get(t.category, 0) + abs(t.amount)
-        
-        if category_totals:
-            fig = px.bar(
-                x=list(category_totals.keys()),
-                y=list(category_totals.values()),
-                title="Expenses by Category (Bar Chart)",
-                labels={'x': 'Category', 'y': 'Amount ($)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    
-    def _show_spending_timeline(self, expenses: List[Transaction]):
-        """Display spending timeline chart."""
-        if not expenses:
-            return
-        
-        # Group by month
-        monthly_spending = {}
-        for t in expenses:
-            month_key = t.transaction_date.strftime('%Y-%m')
-            monthly_spending[month_key] = monthly_spending.get(month_key, 0) + abs(t.amount)
-        
-        if monthly_spending:
-            months = sorted(monthly_spending.keys())
-            amounts = [monthly_spending[month] for month in months]
-            
-            fig = px.line(
-                x=months,
-                y=amounts,
+    def _show_spending_timeline(self, monthly_spending: pd.Series):
+        """Display spending timeline chart from per-month expense totals."""
+        if not monthly_spending.empty:
+            # Long series draw with WebGL; either way only one point per month is sent
+            scatter = go.Scattergl if len(monthly_spending) > WEBGL_MIN_POINTS else go.Scatter
+            fig = go.Figure(scatter(
+                x=month_labels(monthly_spending.index),
+                y=monthly_spending.to_numpy(),
+                mode='lines+markers'
+            ))
+            fig.update_layout(
                 title="Monthly Spending Trend",
-                labels={'x': 'Month', 'y': 'Amount ($)'}
+                xaxis_title="Month",
+                yaxis_title="Amount ($)",
+                hovermode='x'
             )
-            fig.update_traces(mode='lines+markers')
             st.plotly_chart(fig, use_container_width=True)
     
     def _show_categories_page(self):
@@ -1260,6 +1609,7 @@ class ExpenseTrackerUI:
                     success = self.db.create_category(new_category_name, parent)
                     
                     if success:
+                        self._invalidate_data()
                         st.success(f"✅ Created category '{new_category_name}'")
                         
                         # Show next steps
@@ -1334,12 +1684,13 @@ class ExpenseTrackerUI:
             )
         
         if old_category and new_category and new_category != old_category:
-            if new_category in categories:
+            if new_category in category_stats:
                 st.warning(f"Category '{new_category}' already exists. This will merge the categories.")
             
             if st.button("Rename Category", type="primary", key="rename_button"):
                 try:
                     updated_count = self.db.rename_category(old_category, new_category)
+                    self._invalidate_data()
                     st.success(f"Successfully renamed '{old_category}' to '{new_category}' for {updated_count} transactions")
                     st.rerun()
                 except Exception as e:
@@ -1381,6 +1732,7 @@ class ExpenseTrackerUI:
                 if st.button("Merge Categories", type="primary", key="merge_button"):
                     try:
                         updated_count = self.db.merge_categories(categories_to_merge, target_category)
+                        self._invalidate_data()
                         st.success(f"Successfully merged {len(categories_to_merge)} categories into '{target_category}' for {updated_count} transactions")
                         st.rerun()
                     except Exception as e:
@@ -1419,6 +1771,7 @@ class ExpenseTrackerUI:
             if st.button("Delete Category", type="secondary", key="delete_button"):
                 try:
                     updated_count = self.db.delete_category(category_to_delete, replacement_category)
+                    self._invalidate_data()
                     st.success(f"Successfully deleted category '{category_to_delete}' and moved {updated_count} transactions to '{replacement_category}'")
                     st.rerun()
                 except Exception as e:
@@ -1430,36 +1783,27 @@ class ExpenseTrackerUI:
         st.info("This feature suggests categories based on common patterns in transaction descriptions.")
         
         # Get uncategorized or poorly categorized transactions
-        uncategorized = [t for t in st.session_state.transactions 
-                        if t.category.lower() in ['uncategorized', 'other', 'misc', 'miscellaneous']]
-        
-        if not uncategorized:
+        frame = st.session_state.transactions_df
+        uncategorized_mask = frame['category'].str.lower().isin(
+            ['uncategorized', 'other', 'misc', 'miscellaneous']
+        ).to_numpy()
+        uncategorized_positions = np.flatnonzero(uncategorized_mask)
+        uncategorized = frame.iloc[uncategorized_positions]
+        
+        if uncategorized.empty:
             st.success("All transactions appear to be categorized!")
             return
         
         st.write(f"Found {len(uncategorized)} transactions that could benefit from auto-categorization")
         
-        # Common categorization patterns
-        patterns = {
-            'Groceries': ['grocery', 'supermarket', 'food', 'market', 'kroger', 'walmart', 'target'],
-            'Gas': ['gas', 'fuel', 'shell', 'exxon', 'bp', 'chevron', 'mobil'],
-            'Restaurants': ['restaurant', 'cafe', 'coffee', 'starbucks', 'mcdonald', 'subway', 'pizza'],
-            'Shopping': ['amazon', 'ebay', 'store', 'shop', 'retail', 'mall'],
-            'Utilities': ['electric', 'water', 'gas bill', 'internet', 'phone', 'cable'],
-            'Transportation': ['uber', 'lyft', 'taxi', 'bus', 'train', 'parking'],
-            'Entertainment': ['movie', 'theater', 'netflix', 'spotify', 'game', 'entertainment'],
-            'Healthcare': ['medical', 'doctor', 'pharmacy', 'hospital', 'health', 'dental']
-        }
+        matches = keyword_matches(uncategorized, AUTO_CATEGORY_PATTERNS)
+        pattern_names = list(AUTO_CATEGORY_PATTERNS)
+        all_transactions = st.session_state.transactions
         
         suggestions = {}
-        for transaction in uncategorized:
-            desc_lower = transaction.description.lower()
-            for category, keywords in patterns.items():
-                if any(keyword in desc_lower for keyword in keywords):
-                    if category not in suggestions:
-                        suggestions[category] = []
-                    suggestions[category].append(transaction)
-                    break
+        for position, match in zip(uncategorized_positions, matches):
+            if match >= 0:
+                suggestions.setdefault(pattern_names[match], []).append(all_transactions[position])
         
         if suggestions:
             st.write("**Categorization Suggestions:**")
@@ -1476,10 +1820,10 @@ class ExpenseTrackerUI:
                     
                     if st.button(f"Apply '{category}' to {len(transactions)} transactions", key=f"auto_cat_{category}"):
                         try:
-                            updated_count = 0
-                            for transaction in transactions:
-                                if self.db.update_transaction_category(transaction.id, category):
-                                    updated_count += 1
+                            ids = [t.id for t in transactions]
+                            updated_count = self.db.update_transactions_batch(ids, category=category)
+                            if updated_count:
+                                self._apply_category_locally(ids, category)
                             
                             st.success(f"Successfully categorized {updated_count} transactions as '{category}'")
                             st.rerun()
@@ -1488,14 +1832,15 @@ class ExpenseTrackerUI:
         else:
             st.info("No automatic categorization suggestions found for uncategorized transactions.")
     
-    def _show_analytics_summary(self, transactions, expenses, payments):
+    def _show_analytics_summary(self, frame: pd.DataFrame):
         """Show analytics summary metrics."""
         col1, col2, col3, col4, col5 = st.columns(5)
         
-        total_expenses = sum(abs(t.amount) for t in expenses)
-        total_payments = sum(t.amount for t in payments)
-        avg_expense = total_expenses / len(expenses) if expenses else 0
-        largest_expense = max(abs(t.amount) for t in expenses) if expenses else 0
+        expense_amounts = frame['abs_amount'].to_numpy()[frame['is_expense'].to_numpy()]
+        total_expenses = expense_amounts.sum()
+        total_payments = frame['amount'].to_numpy()[frame['is_payment'].to_numpy()].sum()
+        avg_expense = total_expenses / expense_amounts.size if expense_amounts.size else 0
+        largest_expense = expense_amounts.max(initial=0.0)
         
         with col1:
             st.metric("Total Expenses", f"${total_expenses:.2f}")
@@ -1509,145 +1854,139 @@ class ExpenseTrackerUI:
             st.metric("Largest Expense", f"${largest_expense:.2f}")
     
     @perf_monitor.time_operation("show_enhanced_category_charts")
-    def _show_enhanced_category_charts(self, expenses):
-        """Show enhanced category visualization charts."""
+    def _show_enhanced_category_charts(self, expenses: pd.DataFrame, summary: pd.DataFrame):
+        """Show enhanced category visualization charts from the ``category_summary`` of ``expenses``."""
         # Optimize for large datasets
         if len(expenses) > 1000:
             st.info(f"⚡ Optimizing charts for {len(expenses)} transactions")
         
-        category_data = {}
-        for t in expenses:
-            category_data[t.category] = category_data.get(t.category, 0) + abs(t.amount)
-        
-        if not category_data:
+        if summary.empty:
             st.info("No expense data available for category analysis.")
             return
         
-        # Sort categories by amount
-        sorted_categories = sorted(category_data.items(), key=lambda x: x[1], reverse=True)
+        totals = summary['amount']
+        categories = totals.index.to_numpy()
+        amounts = totals.to_numpy()
         
         col1, col2 = st.columns(2)
         
         with col1:
-            # Enhanced pie chart with better formatting
-            fig_pie = px.pie(
-                values=[item[1] for item in sorted_categories],
-                names=[item[0] for item in sorted_categories],
-                title="Spending Distribution by Category",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig_pie.update_traces(
-                textposition='inside',
-                textinfo='percent+label',
-                hovertemplate='<b>%{label}</b><br>Amount: $%{value:.2f}<br>Percentage: %{percent}<extra></extra>'
-            )
-            fig_pie.update_layout(showlegend=True, height=400)
-            st.plotly_chart(fig_pie, use_container_width=True, key="category_pie")
+            def pie_figure():
+                # Enhanced pie chart with better formatting; small categories share one slice
+                pie_totals = top_with_other(totals)
+                palette = px.colors.qualitative.Set3
+                fig_pie = go.Figure(go.Pie(
+                    labels=pie_totals.index.to_numpy(),
+                    values=pie_totals.to_numpy(),
+                    sort=False,
+                    marker=dict(colors=[palette[i % len(palette)] for i in range(len(pie_totals))]),
+                    textposition='inside',
+                    textinfo='percent+label',
+                    hovertemplate='<b>%{label}</b><br>Amount: $%{value:.2f}<br>Percentage: %{percent}<extra></extra>'
+                ))
+                fig_pie.update_layout(title="Spending Distribution by Category", showlegend=True, height=400)
+                return fig_pie
+            
+            st.plotly_chart(self._memo_figure('category_pie', pie_figure), use_container_width=True, key="category_pie")
         
         with col2:
-            # Enhanced bar chart with better formatting
-            fig_bar = px.bar(
-                x=[item[0] for item in sorted_categories],
-                y=[item[1] for item in sorted_categories],
-                title="Spending by Category (Detailed)",
-                labels={'x': 'Category', 'y': 'Amount ($)'},
-                color=[item[1] for item in sorted_categories],
-                color_continuous_scale='Viridis'
-            )
-            fig_bar.update_traces(
-                hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
-            )
-            fig_bar.update_layout(
-                xaxis_tickangle=-45,
-                height=400,
-                coloraxis_showscale=False
-            )
-            st.plotly_chart(fig_bar, use_container_width=True, key="category_bar")
+            def bar_figure():
+                # Enhanced bar chart with better formatting
+                fig_bar = px.bar(
+                    x=categories,
+                    y=amounts,
+                    title="Spending by Category (Detailed)",
+                    labels={'x': 'Category', 'y': 'Amount ($)'},
+                    color=amounts,
+                    color_continuous_scale='Viridis'
+                )
+                fig_bar.update_traces(
+                    hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
+                )
+                fig_bar.update_layout(
+                    xaxis_tickangle=-45,
+                    height=400,
+                    coloraxis_showscale=False
+                )
+                return fig_bar
+            
+            st.plotly_chart(self._memo_figure('category_bar', bar_figure), use_container_width=True, key="category_bar")
         
         # Category comparison table
         st.write("**Category Breakdown**")
-        total_expenses = sum(item[1] for item in sorted_categories)
-        
-        comparison_data = []
-        for category, amount in sorted_categories:
-            percentage = (amount / total_expenses) * 100
-            transaction_count = len([t for t in expenses if t.category == category])
-            avg_per_transaction = amount / transaction_count if transaction_count > 0 else 0
-            
-            comparison_data.append({
-                'Category': category,
-                'Amount': f"${amount:.2f}",
-                'Percentage': f"{percentage:.1f}%",
-                'Transactions': transaction_count,
-                'Avg per Transaction': f"${avg_per_transaction:.2f}"
-            })
-        
-        comparison_df = pd.DataFrame(comparison_data)
+        total_expenses = amounts.sum()
+        
+        # Built column by column; every category in the summary has at least one transaction
+        comparison_df = pd.DataFrame({
+            'Category': categories,
+            'Amount': ('$' + format_amounts(totals)).to_numpy(),
+            'Percentage': np.char.mod('%.1f%%', amounts / total_expenses * 100),
+            'Transactions': summary['count'].to_numpy(),
+            'Avg per Transaction': ('$' + format_amounts(totals / summary['count'])).to_numpy()
+        })
         st.dataframe(comparison_df, use_container_width=True, hide_index=True)
     
-    def _show_enhanced_timeline_charts(self, expenses):
-        """Show enhanced timeline visualization charts."""
-        if not expenses:
+    def _show_enhanced_timeline_charts(self, analysis: dict):
+        """Show enhanced timeline visualization charts from the ``_analysis_data`` aggregates."""
+        if analysis['expenses'].empty:
             st.info("No expense data available for timeline analysis.")
             return
         
         # Monthly spending analysis
-        monthly_data = {}
-        daily_data = {}
-        
-        for t in expenses:
-            month_key = t.transaction_date.strftime('%Y-%m')
-            day_key = t.transaction_date.strftime('%Y-%m-%d')
-            amount = abs(t.amount)
-            
-            monthly_data[month_key] = monthly_data.get(month_key, 0) + amount
-            daily_data[day_key] = daily_data.get(day_key, 0) + amount
+        daily_data = analysis['daily']
+        monthly_data = analysis['monthly']
+        months = month_labels(monthly_data.index)
         
         col1, col2 = st.columns(2)
         
         with col1:
             # Monthly trend
             if len(monthly_data) > 1:
-                months = sorted(monthly_data.keys())
-                amounts = [monthly_data[month] for month in months]
+                def monthly_figure():
+                    fig_monthly = px.line(
+                        x=months,
+                        y=monthly_data.to_numpy(),
+                        title="Monthly Spending Trend",
+                        labels={'x': 'Month', 'y': 'Amount ($)'},
+                        markers=True,
+                        render_mode='webgl' if len(months) > WEBGL_MIN_POINTS else 'svg'
+                    )
+                    fig_monthly.update_traces(
+                        line=dict(width=3),
+                        marker=dict(size=8),
+                        hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
+                    )
+                    fig_monthly.update_layout(height=400, hovermode='x')
+                    return fig_monthly
                 
-                fig_monthly = px.line(
-                    x=months,
-                    y=amounts,
-                    title="Monthly Spending Trend",
-                    labels={'x': 'Month', 'y': 'Amount ($)'},
-                    markers=True
-                )
-                fig_monthly.update_traces(
-                    line=dict(width=3),
-                    marker=dict(size=8),
-                    hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
-                )
-                fig_monthly.update_layout(height=400)
-                st.plotly_chart(fig_monthly, use_container_width=True, key="monthly_trend")
+                st.plotly_chart(self._memo_figure('monthly_trend', monthly_figure), use_container_width=True,
+                                key="monthly_trend")
             else:
                 st.info("Need multiple months of data for trend analysis.")
         
         with col2:
             # Daily spending pattern (last 30 days if available)
             if len(daily_data) > 7:
-                recent_days = sorted(daily_data.keys())[-30:]  # Last 30 days
-                recent_amounts = [daily_data[day] for day in recent_days]
-                
-                fig_daily = px.bar(
-                    x=recent_days,
-                    y=recent_amounts,
-                    title="Daily Spending Pattern (Last 30 Days)",
-                    labels={'x': 'Date', 'y': 'Amount ($)'}
-                )
-                fig_daily.update_traces(
-                    hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
-                )
-                fig_daily.update_layout(
-                    xaxis_tickangle=-45,
-                    height=400
-                )
-                st.plotly_chart(fig_daily, use_container_width=True, key="daily_pattern")
+                def daily_figure():
+                    recent = daily_data.iloc[-30:]  # Last 30 days
+                    
+                    fig_daily = px.bar(
+                        x=np.datetime_as_string(recent.index.to_numpy(), unit='D'),
+                        y=recent.to_numpy(),
+                        title="Daily Spending Pattern (Last 30 Days)",
+                        labels={'x': 'Date', 'y': 'Amount ($)'}
+                    )
+                    fig_daily.update_traces(
+                        hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
+                    )
+                    fig_daily.update_layout(
+                        xaxis_tickangle=-45,
+                        height=400
+                    )
+                    return fig_daily
+                
+                st.plotly_chart(self._memo_figure('daily_pattern', daily_figure), use_container_width=True,
+                                key="daily_pattern")
             else:
                 st.info("Need more daily data for pattern analysis.")
         
@@ -1655,140 +1994,82 @@ class ExpenseTrackerUI:
         if len(monthly_data) > 1:
             st.write("**Category Trends Over Time**")
             
-            # Get top 5 categories
-            category_totals = {}
-            for t in expenses:
-                category_totals[t.category] = category_totals.get(t.category, 0) + abs(t.amount)
-            
-            top_categories = sorted(category_totals.items(), key=lambda x: x[1], reverse=True)[:5]
-            
-            # Build monthly data for each category
-            category_monthly_data = {}
-            for category, _ in top_categories:
-                category_monthly_data[category] = {}
-                for t in expenses:
-                    if t.category == category:
-                        month_key = t.transaction_date.strftime('%Y-%m')
-                        category_monthly_data[category][month_key] = (
-                            category_monthly_data[category].get(month_key, 0) + abs(t.amount)
-                        )
-            
-            # Create multi-line chart
-            fig_category_trends = go.Figure()
-            
-            months = sorted(monthly_data.keys())
-            colors = px.colors.qualitative.Set1
-            
-            for i, (category, _) in enumerate(top_categories):
-                amounts = [category_monthly_data[category].get(month, 0) for month in months]
-                fig_category_trends.add_trace(go.Scatter(
-                    x=months,
-                    y=amounts,
-                    mode='lines+markers',
-                    name=category,
-                    line=dict(color=colors[i % len(colors)], width=2),
+            def category_trends_figure():
+                # Monthly data for the top 5 categories, one column per line
+                category_monthly_data = analysis['category_monthly']
+                trends = pd.DataFrame(
+                    category_monthly_data.to_numpy(), index=months, columns=list(category_monthly_data.columns)
+                )
+                
+                # Create multi-line chart from the wide frame in one call
+                fig_category_trends = px.line(
+                    trends,
+                    markers=True,
+                    color_discrete_sequence=px.colors.qualitative.Set1,
+                    render_mode='webgl' if len(months) > WEBGL_MIN_POINTS else 'svg'
+                )
+                fig_category_trends.update_traces(
+                    line=dict(width=2),
                     marker=dict(size=6),
-                    hovertemplate=f'<b>{category}</b><br>%{{x}}<br>Amount: $%{{y:.2f}}<extra></extra>'
-                ))
-            
-            fig_category_trends.update_layout(
-                title="Top Categories Spending Trends",
-                xaxis_title="Month",
-                yaxis_title="Amount ($)",
-                height=400,
-                hovermode='x unified'
-            )
+                    hovertemplate='<b>%{fullData.name}</b><br>%{x}<br>Amount: $%{y:.2f}<extra></extra>'
+                )
+                
+                fig_category_trends.update_layout(
+                    title="Top Categories Spending Trends",
+                    xaxis_title="Month",
+                    yaxis_title="Amount ($)",
+                    legend_title_text=None,
+                    height=400,
+                    hovermode='x unified'
+                )
+                return fig_category_trends
             
-            st.plotly_chart(fig_category_trends, use_container_width=True, key="category_trends")
+            st.plotly_chart(self._memo_figure('category_trends', category_trends_figure), use_container_width=True,
+                            key="category_trends")
     
-    def _show_transaction_analysis_charts(self, expenses):
-        """Show transaction analysis charts."""
-        if not expenses:
+    def _show_transaction_analysis_charts(self, analysis: dict):
+        """Show transaction analysis charts from the ``_analysis_data`` aggregates."""
+        if analysis['expenses'].empty:
             return
         
         col1, col2 = st.columns(2)
         
         with col1:
-            # Amount distribution histogram
-            amounts = [abs(t.amount) for t in expenses]
-            
-            fig_hist = px.histogram(
-                x=amounts,
-                nbins=20,
-                title="Transaction Amount Distribution",
-                labels={'x': 'Amount ($)', 'y': 'Number of Transactions'}
-            )
-            fig_hist.update_traces(
-                hovertemplate='Amount Range: $%{x}<br>Transactions: %{y}<extra></extra>'
-            )
-            fig_hist.update_layout(height=400)
+            # Amount distribution histogram, binned in advance so only the 20 bin counts reach the browser
+            counts, edges = analysis['histogram']
+            fig_hist = _amount_histogram_figure(tuple(counts.tolist()), tuple(edges.tolist()))
             st.plotly_chart(fig_hist, use_container_width=True, key="amount_distribution")
         
         with col2:
             # Day of week analysis
-            day_spending = {}
-            day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            
-            for t in expenses:
-                day_name = day_names[t.transaction_date.weekday()]
-                day_spending[day_name] = day_spending.get(day_name, 0) + abs(t.amount)
-            
-            # Ensure all days are present
-            for day in day_names:
-                if day not in day_spending:
-                    day_spending[day] = 0
-            
-            fig_dow = px.bar(
-                x=day_names,
-                y=[day_spending[day] for day in day_names],
-                title="Spending by Day of Week",
-                labels={'x': 'Day of Week', 'y': 'Amount ($)'},
-                color=[day_spending[day] for day in day_names],
-                color_continuous_scale='Blues'
-            )
-            fig_dow.update_traces(
-                hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
-            )
-            fig_dow.update_layout(height=400, coloraxis_showscale=False)
+            fig_dow = _weekday_figure(tuple(analysis['weekday'].tolist()))
             st.plotly_chart(fig_dow, use_container_width=True, key="day_of_week")
     
-    def _show_payment_analysis(self, payments):
-        """Show payment analysis charts."""
-        if not payments:
+    def _show_payment_analysis(self, analysis: dict):
+        """Show payment analysis charts from the ``_analysis_data`` aggregates."""
+        payments = analysis['payments']
+        if payments.empty:
             return
         
+        amounts = payments['amount'].to_numpy()
+        
         col1, col2 = st.columns(2)
         
         with col1:
-            # Payment amounts over time
-            payment_data = {}
-            for t in payments:
-                month_key = t.transaction_date.strftime('%Y-%m')
-                payment_data[month_key] = payment_data.get(month_key, 0) + t.amount
-            
-            if payment_data:
-                months = sorted(payment_data.keys())
-                amounts = [payment_data[month] for month in months]
-                
-                fig_payments = px.bar(
-                    x=months,
-                    y=amounts,
-                    title="Monthly Payments",
-                    labels={'x': 'Month', 'y': 'Amount ($)'},
-                    color=amounts,
-                    color_continuous_scale='Greens'
-                )
-                fig_payments.update_traces(
-                    hovertemplate='<b>%{x}</b><br>Amount: $%{y:.2f}<extra></extra>'
+            # Payment amounts over time (payments are positive, so their totals are plain sums)
+            payment_data = analysis['payment_monthly']
+            
+            if not payment_data.empty:
+                fig_payments = _monthly_payments_figure(
+                    tuple(month_labels(payment_data.index).tolist()), tuple(payment_data.tolist())
                 )
-                fig_payments.update_layout(height=400, coloraxis_showscale=False)
                 st.plotly_chart(fig_payments, use_container_width=True, key="monthly_payments")
         
         with col2:
             # Payment summary
-            total_payments = sum(t.amount for t in payments)
-            avg_payment = total_payments / len(payments) if payments else 0
-            largest_payment = max(t.amount for t in payments) if payments else 0
+            total_payments = amounts.sum()
+            avg_payment = total_payments / amounts.size
+            largest_payment = amounts.max()
             
             st.metric("Total Payments", f"${total_payments:.2f}")
             st.metric("Average Payment", f"${avg_payment:.2f}")
@@ -1798,10 +2079,6 @@ class ExpenseTrackerUI:
     def _export_charts(self, expenses, format_type):
         """Export charts in specified format."""
         try:
-            import plotly.io as pio
-            import base64
-            from io import BytesIO
-            
             st.info(f"Exporting charts in {format_type} format...")
             
             # This is a placeholder for chart export functionality
@@ -1874,16 +2151,20 @@ class ExpenseTrackerUI:
         with col1:
             if st.button("📥 Generate Export", type="primary", key="generate_export"):
                 try:
+                    # One clock reading for the file name and any export date in the content
+                    now = datetime.now()
+                    timestamp = now.strftime('%Y%m%d_%H%M%S')
+                    
                     if export_scope == "Category Statistics Only":
                         if export_format == "CSV":
                             content = exporter.export_category_stats_to_csv()
-                            filename = f"category_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                            filename = f"category_stats_{timestamp}.csv"
                             content_type = "text/csv"
                         else:
                             # JSON export of just category stats
                             stats_data = {
                                 'metadata': {
-                                    'export_date': datetime.now().isoformat(),
+                                    'export_date': now.isoformat(),
                                     'version': '1.0',
                                     'export_type': 'category_statistics',
                                     'application': 'Personal Expense Tracker'
@@ -1891,60 +2172,82 @@ class ExpenseTrackerUI:
                                 'category_stats': self.db.get_category_stats(),
                                 'categories': self.db.get_categories()
                             }
-                            content = json.dumps(stats_data, indent=2, ensure_ascii=False)
-                            filename = f"category_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                            content = dumps_json(stats_data)
+                            filename = f"category_stats_{timestamp}.json"
                             content_type = "application/json"
                     else:
                         if export_format == "CSV":
                             content = exporter.export_to_csv(transactions_to_export)
-                            filename = f"transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                            filename = f"transactions_{timestamp}.csv"
                             content_type = "text/csv"
                         else:
                             content = exporter.export_to_json(transactions_to_export)
-                            filename = f"transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                            filename = f"transactions_{timestamp}.json"
                             content_type = "application/json"
                     
-                    # Store in session state for download
-                    st.session_state.export_content = content
+                    # Keep the export on disk rather than in session state, where every rerun would carry it
+                    self._discard_export()
+                    _remove_stale_exports()
+                    with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', delete=False,
+                                                     dir=EXPORT_DIR, prefix='export_',
+                                                     suffix=os.path.splitext(filename)[1]) as export_file:
+                        export_file.write(content)
+                    st.session_state.export_path = export_file.name
                     st.session_state.export_filename = filename
                     st.session_state.export_content_type = content_type
+                    # Counted once here so the preview reads only the lines it shows
+                    st.session_state.export_line_count = content.count('\n') + 1
                     
                     st.success(f"Export generated successfully! File size: {len(content)} characters")
                     
                 except Exception as e:
                     st.error(f"Export failed: {e}")
         
+        # A stored path can outlive its file (e.g. a cleaned temp directory)
+        if 'export_path' in st.session_state and not os.path.exists(st.session_state.export_path):
+            self._discard_export()
+        
         with col2:
-            if 'export_content' in st.session_state:
+            if 'export_path' in st.session_state:
                 # Create download button
-                st.download_button(
-                    label=f"📥 Download {st.session_state.export_filename}",
-                    data=st.session_state.export_content,
-                    file_name=st.session_state.export_filename,
-                    mime=st.session_state.export_content_type,
-                    key="download_export"
-                )
+                with open(st.session_state.export_path, 'rb') as export_file:
+                    st.download_button(
+                        label=f"📥 Download {st.session_state.export_filename}",
+                        data=export_file,
+                        file_name=st.session_state.export_filename,
+                        mime=st.session_state.export_content_type,
+                        key="download_export"
+                    )
         
         with col3:
-            if 'export_content' in st.session_state:
+            if 'export_path' in st.session_state:
                 if st.button("🗑️ Clear Export", key="clear_export"):
-                    del st.session_state.export_content
-                    del st.session_state.export_filename
-                    del st.session_state.export_content_type
+                    self._discard_export()
                     st.rerun()
         
         # Preview export content
-        if 'export_content' in st.session_state:
+        if 'export_path' in st.session_state:
             st.subheader("📋 Export Preview")
             
             # Show first few lines of export
-            content_lines = st.session_state.export_content.split('\n')
-            preview_lines = content_lines[:10]
+            with open(st.session_state.export_path, encoding='utf-8', newline='\n') as export_file:
+                preview = ''.join(islice(export_file, 10))
             
-            st.code('\n'.join(preview_lines), language='text')
+            st.code(preview[:-1] if preview.endswith('\n') else preview, language='text')
             
-            if len(content_lines) > 10:
-                st.write(f"... and {len(content_lines) - 10} more lines")
+            line_count = st.session_state.export_line_count
+            if line_count > 10:
+                st.write(f"... and {line_count - 10} more lines")
+    
+    @staticmethod
+    def _discard_export():
+        """Delete the generated export file, if any, and forget it."""
+        path = st.session_state.pop('export_path', None)
+        st.session_state.pop('export_filename', None)
+        st.session_state.pop('export_content_type', None)
+        st.session_state.pop('export_line_count', None)
+        if path and os.path.exists(path):
+            os.unlink(path)
     
     def _show_import_tab(self, importer: DataImporter):
         """Show the import data interface."""
@@ -1961,8 +2264,8 @@ class ExpenseTrackerUI:
         
         if uploaded_file is not None:
             try:
-                # Read file content
-                json_content = uploaded_file.read().decode('utf-8')
+                # Raw upload bytes; json.loads decodes them itself, so no text copy is made
+                json_content = uploaded_file.getvalue()
                 
                 # Validate import data
                 validation_result = importer.validate_json_import(json_content)
@@ -2000,6 +2303,7 @@ class ExpenseTrackerUI:
                         try:
                             with st.spinner("Importing transactions..."):
                                 import_result = importer.import_from_json(json_content)
+                            self._invalidate_data()
                             
                             st.success("Import completed!")
                             
@@ -2063,7 +2367,6 @@ class ExpenseTrackerUI:
                     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                     if backup_name.strip():
                         # Sanitize backup name (remove special characters)
-                        import re
                         sanitized_name = re.sub(r'[^\w\-_]', '_', backup_name.strip())
                         base_name = f"{sanitized_name}_{timestamp}"
                     else:
@@ -2122,7 +2425,7 @@ class ExpenseTrackerUI:
             if backup_file is not None:
                 if restore_type == "JSON Backup":
                     try:
-                        backup_content = backup_file.read().decode('utf-8')
+                        backup_content = backup_file.getvalue()
                         validation = importer.validate_json_import(backup_content)
                         
                         if validation['valid']:
@@ -2133,6 +2436,7 @@ class ExpenseTrackerUI:
                             if st.button("🔄 Restore from JSON Backup", key="restore_json_backup"):
                                 try:
                                     result = importer.import_from_json(backup_content)
+                                    self._invalidate_data()
                                     st.success(f"Restored {result['imported']} transactions!")
                                     
                                     if st.button("🔄 Refresh Page", key="refresh_after_json_restore"):
@@ -2154,21 +2458,22 @@ class ExpenseTrackerUI:
         # Database statistics
         st.subheader("📈 Database Statistics")
         
+        # Counted in the database: large datasets keep only the first page of transactions in memory
+        expense_count, payment_count = StreamlitCache.get_cached_expense_payment_counts(self.db.db_path)
+        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Transactions", len(st.session_state.transactions))
+            st.metric("Total Transactions", StreamlitCache.get_cached_transaction_count(self.db.db_path))
         
         with col2:
             st.metric("Categories", len(st.session_state.categories))
         
         with col3:
-            expenses = [t for t in st.session_state.transactions if t.is_expense()]
-            st.metric("Expenses", len(expenses))
+            st.metric("Expenses", expense_count)
         
         with col4:
-            payments = [t for t in st.session_state.transactions if t.is_payment()]
-            st.metric("Payments", len(payments))
+            st.metric("Payments", payment_count)
     
     def _show_performance_page(self):
         """Display performance monitoring and optimization page."""
@@ -2232,6 +2537,7 @@ class ExpenseTrackerUI:
         with col2:
             if st.button("🔄 Reload Data", key="reload_data"):
                 StreamlitCache.clear_all_cache()
+                self._invalidate_data()
                 st.rerun()
         
         # Database optimization
@@ -2240,18 +2546,10 @@ class ExpenseTrackerUI:
         if st.button("📊 Analyze Database", key="analyze_db"):
             try:
                 with st.spinner("Analyzing database performance..."):
-                    # Run ANALYZE command to update statistics
-                    import sqlite3
-                    with sqlite3.connect(self.db.db_path) as conn:
-                        conn.execute("ANALYZE")
-                        
-                        # Get database size
-                        cursor = conn.execute("SELECT page_count * page_size as size FROM pragma_page_count(), pragma_page_size()")
-                        db_size = cursor.fetchone()[0]
-                        
-                        # Get index information
-                        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name NOT LIKE 'sqlite_%'")
-                        indexes = [row[0] for row in cursor.fetchall()]
+                    # Refresh planner statistics and read back size and indexes
+                    info = self.db.analyze()
+                    db_size = info['size']
+                    indexes = info['indexes']
                 
                 st.success("Database analysis completed!")
                 
@@ -2272,10 +2570,16 @@ class ExpenseTrackerUI:
         # Memory usage (approximate)
         st.subheader("💾 Memory Usage")
         
-        import sys
-        
-        transactions_size = sys.getsizeof(st.session_state.transactions) / 1024 / 1024
-        filtered_size = sys.getsizeof(st.session_state.filtered_transactions) / 1024 / 1024
+        # Transaction objects are sized from a sample; the filtered list only references them, so it adds
+        # its own list plus its frame
+        transactions_size = (
+            estimate_list_memory(st.session_state.transactions) +
+            st.session_state.transactions_df.memory_usage(deep=True).sum()
+        ) / 1024 / 1024
+        filtered_size = (
+            sys.getsizeof(st.session_state.filtered_transactions) +
+            st.session_state.filtered_df.memory_usage(deep=True).sum()
+        ) / 1024 / 1024
         
         col1, col2 = st.columns(2)
         with col1:
@@ -2293,35 +2597,21 @@ class ExpenseTrackerUI:
             show_warning_message("No transactions to import")
             return
         
-        # Create progress tracker
-        progress = ProgressTracker(len(transactions) + 2, "Importing Transactions")
+        # Create progress tracker: one step for validation, then one per inserted row
+        progress = ProgressTracker(len(transactions) + 1, "Importing Transactions")
         
         try:
             # Step 1: Validate transactions
             progress.update(1, "Validating transaction data...")
             
-            valid_transactions = []
-            invalid_count = 0
+            # Same rules as before (non-blank description, non-zero amount), checked column-wise
+            descriptions = pd.Series([t.description for t in transactions], dtype=TEXT_DTYPE).fillna('')
+            amounts = np.fromiter((t.amount for t in transactions), dtype=np.float64, count=len(transactions))
+            valid_mask = (descriptions.str.strip().str.len().to_numpy() > 0) & (amounts != 0)
             
-            for i, transaction in enumerate(transactions):
-                try:
-                    # Basic validation
-                    if not transaction.description.strip():
-                        invalid_count += 1
-                        continue
-                    if transaction.amount == 0:
-                        invalid_count += 1
-                        continue
-                    
-                    valid_transactions.append(transaction)
-                    
-                    # Update progress every 100 transactions
-                    if i % 100 == 0:
-                        progress.update(1, f"Validated {i + 1} of {len(transactions)} transactions...")
-                
-                except Exception as e:
-                    self.logger.warning(f"Invalid transaction skipped: {e}")
-                    invalid_count += 1
+            valid_transactions = list(compress(transactions, valid_mask))
+            invalid_count = len(transactions) - len(valid_transactions)
+            progress.update(1, f"Validated {len(transactions)} transactions")
             
             if invalid_count > 0:
                 show_warning_message(f"Skipped {invalid_count} invalid transactions")
@@ -2330,10 +2620,18 @@ class ExpenseTrackerUI:
                 progress.error("No valid transactions found")
                 return
             
-            # Step 2: Insert transactions
-            progress.update(len(transactions) + 1, f"Inserting {len(valid_transactions)} transactions...")
-            
-            transaction_ids = self.db.insert_transactions_batch(valid_transactions)
+            # Step 2: Insert transactions, one executemany and commit per batch
+            transaction_ids = []
+            for start in range(0, len(valid_transactions), IMPORT_BATCH_SIZE):
+                progress.update(
+                    1 + start,
+                    f"Inserting transactions {start + 1}-{min(start + IMPORT_BATCH_SIZE, len(valid_transactions))} "
+                    f"of {len(valid_transactions)}..."
+                )
+                transaction_ids.extend(
+                    self.db.insert_transactions_batch(valid_transactions[start:start + IMPORT_BATCH_SIZE])
+                )
+            self._invalidate_data()
             
             # Step 3: Complete
             progress.complete(f"Successfully imported {len(transaction_ids)} transactions!")
@@ -2364,6 +2662,7 @@ class ExpenseTrackerUI:
         success = self.db.update_transaction_category(transaction_id, new_category)
         
         if success:
+            self._apply_category_locally([transaction_id], new_category)
             show_success_message(f"Category updated to '{new_category}'")
             return True
         else:
@@ -2387,24 +2686,29 @@ class ExpenseTrackerUI:
         try:
             updated_count = 0
             failed_count = 0
+            updated_ids = []
             
-            for i, transaction in enumerate(transactions):
+            # One UPDATE ... WHERE id IN (...) per batch instead of a statement and commit per row
+            for start in range(0, len(transactions), IMPORT_BATCH_SIZE):
+                batch_ids = [t.id for t in transactions[start:start + IMPORT_BATCH_SIZE]]
                 try:
-                    if self.db.update_transaction_category(transaction.id, new_category):
-                        updated_count += 1
-                    else:
-                        failed_count += 1
-                    
-                    # Update progress every 10 transactions
-                    if i % 10 == 0 or i == len(transactions) - 1:
-                        progress.update(i + 1, f"Updated {updated_count} of {i + 1} transactions...")
-                
+                    batch_updated = self.db.update_transactions_batch(batch_ids, category=new_category)
+                    updated_count += batch_updated
+                    failed_count += len(batch_ids) - batch_updated
+                    updated_ids.extend(batch_ids)
                 except Exception as e:
-                    self.logger.warning(f"Failed to update transaction {transaction.id}: {e}")
-                    failed_count += 1
+                    self.logger.warning(f"Failed to update {len(batch_ids)} transactions: {e}")
+                    failed_count += len(batch_ids)
+                
+                done = start + len(batch_ids)
+                progress.update(done, f"Updated {updated_count} of {done} transactions...")
             
             # Complete with summary
             if updated_count > 0:
+                if failed_count:
+                    self._invalidate_data()
+                else:
+                    self._apply_category_locally(updated_ids, new_category)
                 progress.complete(f"Updated {updated_count} transactions to '{new_category}'")
                 
                 if failed_count > 0:
@@ -2454,7 +2758,7 @@ class ExpenseTrackerUI:
                             # Clear date range filters and other session state
                             self._reset_filters_after_data_deletion()
                             
-                            self._load_data()
+                            self._invalidate_data()
                             st.experimental_rerun()
                         else:
                             st.error("Please type 'DELETE ALL' to confirm")
@@ -2543,8 +2847,7 @@ class ExpenseTrackerUI:
             with col2:
                 # Date range
                 if st.session_state.transactions:
-                    min_date = min(t.transaction_date for t in st.session_state.transactions).date()
-                    max_date = max(t.transaction_date for t in st.session_state.transactions).date()
+                    min_date, max_date = st.session_state.date_bounds
                     
                     date_range = st.date_input(
                         "Date Range",
@@ -2583,7 +2886,7 @@ class ExpenseTrackerUI:
             deleted_count = self.db.delete_transactions_batch(selected_ids)
             st.success(f"✅ Deleted {deleted_count} transactions")
             st.session_state.selected_transactions = []
-            self._load_data()
+            self._invalidate_data()
             st.experimental_rerun()
     
     def _apply_transaction_edits(self, transaction_ids, new_category, find_text, replace_text, amount_adjustment, date_adjustment):
@@ -2629,7 +2932,7 @@ class ExpenseTrackerUI:
         
         st.success(f"✅ Updated {len(transaction_ids)} transactions")
         st.session_state.show_edit_modal = False
-        self._load_data()
+        self._invalidate_data()
         st.experimental_rerun()
     
     def _preview_transaction_edits(self, transaction_ids, new_category, find_text, replace_text, amount_adjustment, date_adjustment):
@@ -2695,7 +2998,7 @@ class ExpenseTrackerUI:
         
         st.success(f"✅ Deleted {deleted_count} matching transactions")
         st.session_state.show_advanced_search = False
-        self._load_data()
+        self._invalidate_data()
         st.experimental_rerun()
     
     def _reset_filters_after_data_deletion(self):
@@ -2722,26 +3025,30 @@ class ExpenseTrackerUI:
         
         # Reset transactions and categories
         st.session_state.transactions = []
-        st.session_state.categories = []
+        self._set_categories([])
         st.session_state.filtered_transactions = []
+        self._set_transaction_frame([])
         
         self.logger.info("Reset all filters and session state after data deletion")
     
     def _analyze_duplicates(self, transactions):
         """Analyze transactions for duplicates and return detailed results."""
         new_transactions = []
-        duplicates = []
+        duplicate_transactions = []
         
-        for transaction in transactions:
-            if not self.db.transaction_exists(transaction):
-                new_transactions.append(transaction)
+        for transaction, exists in zip(transactions, self.db.transactions_exist_batch(transactions)):
+            if exists:
+                duplicate_transactions.append(transaction)
             else:
-                # Find the specific duplicates for this transaction
-                potential_duplicates = self.db.find_potential_duplicates(transaction)
-                duplicates.append({
-                    'new_transaction': transaction,
-                    'existing_duplicates': potential_duplicates
-                })
+                new_transactions.append(transaction)
+        
+        # Find the specific duplicates for the transactions that matched
+        duplicates = [
+            {'new_transaction': transaction, 'existing_duplicates': potential_duplicates}
+            for transaction, potential_duplicates in zip(
+                duplicate_transactions, self.db.find_potential_duplicates_batch(duplicate_transactions)
+            )
+        ]
         
         return {
             'new_transactions': new_transactions,
@@ -2802,12 +3109,10 @@ class ExpenseTrackerUI:
         else:
             st.info("No transactions selected for import.")
     
-    def _show_sankey_diagram(self, transactions):
+    def _show_sankey_diagram(self, frame: pd.DataFrame):
         """Show Sankey diagram for money flow analysis."""
         try:
-            import plotly.graph_objects as go
-            
-            if not transactions:
+            if frame.empty:
                 st.info("No transactions available for Sankey diagram.")
                 return
             
@@ -2829,14 +3134,16 @@ class ExpenseTrackerUI:
                 )
             
             # Filter transactions by time period
-            filtered_transactions = self._filter_transactions_by_period(transactions, time_period)
+            period_frame = self._filter_frame_by_period(frame, time_period)
+            # Relative periods move with the calendar, so the day is part of the figure's name
+            period = (time_period, datetime.now().date())
             
             if sankey_type == "Income → Categories → Subcategories":
-                self._create_income_category_sankey(filtered_transactions)
+                self._create_income_category_sankey(period_frame, period)
             elif sankey_type == "Monthly Flow":
-                self._create_monthly_flow_sankey(filtered_transactions)
+                self._create_monthly_flow_sankey(period_frame, period)
             else:
-                self._create_category_hierarchy_sankey(filtered_transactions)
+                self._create_category_hierarchy_sankey(period_frame)
                 
         except ImportError:
             st.error("Plotly is required for Sankey diagrams. Please install plotly.")
@@ -2844,12 +3151,11 @@ class ExpenseTrackerUI:
             st.error(f"Error creating Sankey diagram: {e}")
             self.logger.error(f"Sankey diagram error: {e}")
     
-    def _filter_transactions_by_period(self, transactions, period):
-        """Filter transactions by time period."""
+    def _filter_frame_by_period(self, frame: pd.DataFrame, period: str) -> pd.DataFrame:
+        """Filter transaction rows by time period."""
         if period == "All Time":
-            return transactions
+            return frame
         
-        from datetime import datetime, timedelta
         today = datetime.now()
         
         if period == "Last 3 Months":
@@ -2859,29 +3165,53 @@ class ExpenseTrackerUI:
         elif period == "This Year":
             cutoff = datetime(today.year, 1, 1)
         else:
-            return transactions
+            return frame
         
-        return [t for t in transactions if t.transaction_date >= cutoff]
+        # Rows are newest-first, so those on or after the cutoff are a prefix found by binary search
+        ascending = frame['transaction_date'].to_numpy()[::-1]
+        count = len(ascending) - int(np.searchsorted(ascending, np.datetime64(cutoff), side='left'))
+        return frame.iloc[:count]
     
-    def _create_income_category_sankey(self, transactions):
+    def _create_income_category_sankey(self, frame: pd.DataFrame, period: tuple):
         """Create Sankey diagram showing income flow to categories."""
-        import plotly.graph_objects as go
+        result = self._memo_figure(('income_category_sankey', period), lambda: self._income_category_sankey(frame))
+        if result is None:
+            st.info("Need both income and expense transactions for this Sankey diagram.")
+            return
+        
+        fig, total_income, total_expenses = result
+        st.plotly_chart(fig, use_container_width=True, key="income_category_sankey")
         
+        # Show summary
+        st.write("**Summary:**")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Income", f"${total_income:.2f}")
+        with col2:
+            st.metric("Total Expenses", f"${total_expenses:.2f}")
+        with col3:
+            st.metric("Net Amount", f"${total_income - total_expenses:.2f}")
+    
+    @staticmethod
+    def _income_category_sankey(frame: pd.DataFrame) -> Optional[tuple]:
+        """Build the income → categories Sankey as ``(figure, total income, total expenses)``, or None without both."""
         # Separate income and expenses
-        income_transactions = [t for t in transactions if t.is_payment()]
-        expense_transactions = [t for t in transactions if t.is_expense()]
+        income_amounts = frame['amount'].to_numpy()[frame['is_payment'].to_numpy()]
+        expense_frame = frame[frame['is_expense'].to_numpy()]
         
-        if not income_transactions or not expense_transactions:
-            st.info("Need both income and expense transactions for this Sankey diagram.")
-            return
+        if not len(income_amounts) or expense_frame.empty:
+            return None
         
         # Calculate totals
-        total_income = sum(t.amount for t in income_transactions)
-        
-        # Group expenses by category
-        category_expenses = {}
-        for t in expense_transactions:
-            category_expenses[t.category] = category_expenses.get(t.category, 0) + abs(t.amount)
+        total_income = income_amounts.sum()
+        
+        # Group expenses by category, in order of first appearance
+        category_expenses = (
+            expense_frame['abs_amount']
+            .groupby(expense_frame['category'], sort=False, observed=True)
+            .sum()
+            .to_dict()
+        )
         
         # Create nodes and links
         nodes = ["Income"] + list(category_expenses.keys())
@@ -2914,63 +3244,54 @@ class ExpenseTrackerUI:
             font_size=12,
             height=600
         )
-        
-        st.plotly_chart(fig, use_container_width=True, key="income_category_sankey")
-        
-        # Show summary
-        st.write("**Summary:**")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Income", f"${total_income:.2f}")
-        with col2:
-            st.metric("Total Expenses", f"${sum(category_expenses.values()):.2f}")
-        with col3:
-            st.metric("Net Amount", f"${total_income - sum(category_expenses.values()):.2f}")
+        return fig, total_income, sum(category_expenses.values())
     
-    def _create_monthly_flow_sankey(self, transactions):
+    def _create_monthly_flow_sankey(self, frame: pd.DataFrame, period: tuple):
         """Create Sankey diagram showing monthly money flow."""
-        import plotly.graph_objects as go
+        result = self._memo_figure(('monthly_flow_sankey', period), lambda: self._monthly_flow_sankey(frame))
+        if isinstance(result, str):
+            st.info(result)
+            return
         
-        # Group transactions by month and category
-        monthly_data = {}
-        for t in transactions:
-            month_key = t.transaction_date.strftime('%Y-%m')
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {}
-            
-            category = t.category
-            if category not in monthly_data[month_key]:
-                monthly_data[month_key][category] = 0
-            
-            monthly_data[month_key][category] += abs(t.amount) if t.is_expense() else 0
+        st.plotly_chart(result, use_container_width=True, key="monthly_flow_sankey")
+    
+    @staticmethod
+    def _monthly_flow_sankey(frame: pd.DataFrame):
+        """Build the months → categories Sankey figure, or the message to show when there is too little data."""
+        # Month of every transaction; expense totals per (month, category)
+        month_keys = month_labels(frame['transaction_date'].to_numpy())
+        is_expense = frame['is_expense'].to_numpy()
+        monthly_expenses = (
+            frame['abs_amount'][is_expense]
+            .groupby([month_keys[is_expense], frame['category'][is_expense].to_numpy(dtype=object)])
+            .sum()
+        )
         
-        if len(monthly_data) < 2:
-            st.info("Need at least 2 months of data for monthly flow Sankey diagram.")
-            return
+        all_months = np.unique(month_keys)
+        if len(all_months) < 2:
+            return "Need at least 2 months of data for monthly flow Sankey diagram."
         
         # Create nodes (months + categories)
-        months = sorted(monthly_data.keys())[-6:]  # Last 6 months
-        all_categories = set()
-        for month_data in monthly_data.values():
-            all_categories.update(month_data.keys())
+        months = all_months[-6:].tolist()  # Last 6 months
+        all_categories = frame['category'].astype(object).unique().tolist()
         
-        nodes = months + list(all_categories)
+        nodes = months + all_categories
         
         # Create links
+        month_index = {month: i for i, month in enumerate(months)}
+        category_index = {category: len(months) + i for i, category in enumerate(all_categories)}
         sources = []
         targets = []
         values = []
         
-        for i, month in enumerate(months):
-            for category, amount in monthly_data[month].items():
-                if amount > 0:
-                    sources.append(i)  # Month index
-                    targets.append(len(months) + list(all_categories).index(category))  # Category index
-                    values.append(amount)
+        for (month, category), amount in monthly_expenses.items():
+            if month in month_index and amount > 0:
+                sources.append(month_index[month])
+                targets.append(category_index[category])
+                values.append(amount)
         
         if not sources:
-            st.info("No expense data available for monthly flow diagram.")
-            return
+            return "No expense data available for monthly flow diagram."
         
         # Create Sankey diagram
         fig = go.Figure(data=[go.Sankey(
@@ -2993,13 +3314,10 @@ class ExpenseTrackerUI:
             font_size=12,
             height=600
         )
-        
-        st.plotly_chart(fig, use_container_width=True, key="monthly_flow_sankey")
+        return fig
     
-    def _create_category_hierarchy_sankey(self, transactions):
+    def _create_category_hierarchy_sankey(self, frame: pd.DataFrame):
         """Create Sankey diagram showing category hierarchy."""
-        import plotly.graph_objects as go
-        
         # Get category hierarchy
         hierarchy = self.db.get_category_hierarchy()
         
@@ -3011,10 +3329,7 @@ class ExpenseTrackerUI:
             return
         
         # Calculate amounts for each category
-        category_amounts = {}
-        for t in transactions:
-            if t.is_expense():
-                category_amounts[t.category] = category_amounts.get(t.category, 0) + abs(t.amount)
+        category_amounts = category_totals(frame[frame['is_expense'].to_numpy()]).to_dict()
         
         # Create nodes and links based on hierarchy
         nodes = []
@@ -3155,38 +3470,45 @@ class ExpenseTrackerUI:
         root_categories = [cat for cat, info in hierarchy.items() if info['parent'] is None]
         
         if root_categories:
+            # Per-category counts and expense totals from one grouped query, instead of loading every
+            # category's transactions and testing each one
+            stats = StreamlitCache.get_cached_category_stats(self.db.db_path)
+            
             for root_cat in root_categories:
                 # Get transaction count for this category and its children
-                category_transactions = self.db.get_transactions_by_category_hierarchy(root_cat, include_children=True)
-                transaction_count = len(category_transactions)
-                total_amount = sum(abs(t.amount) for t in category_transactions if t.is_expense())
+                subtree = {root_cat}
+                pending = [root_cat]
+                while pending:
+                    children = hierarchy.get(pending.pop(), {}).get('children', [])
+                    pending.extend(child for child in children if child not in subtree)
+                    subtree.update(children)
+                
+                subtree_stats = [stats[cat] for cat in subtree if cat in stats]
+                transaction_count = sum(stat['transaction_count'] for stat in subtree_stats)
+                total_amount = sum(stat['total_expenses'] for stat in subtree_stats)
                 
                 st.write(f"📁 **{root_cat}** ({transaction_count} transactions, ${total_amount:.2f})")
-                self._display_category_tree_with_stats(root_cat, hierarchy, level=1)
+                self._display_category_tree_with_stats(root_cat, hierarchy, stats, level=1)
         else:
             st.info("All categories are at root level (no hierarchy defined).")
     
-    def _display_category_tree_with_stats(self, category, hierarchy, level=0):
+    def _display_category_tree_with_stats(self, category, hierarchy, stats, level=0):
         """Display category tree with transaction statistics."""
         indent = "  " * level
         
         if category in hierarchy:
             for child in hierarchy[category]['children']:
                 # Get stats for this child category
-                child_transactions = self.db.get_transactions_by_category_hierarchy(child, include_children=False)
-                transaction_count = len(child_transactions)
-                total_amount = sum(abs(t.amount) for t in child_transactions if t.is_expense())
+                child_stats = stats.get(child, {})
+                transaction_count = child_stats.get('transaction_count', 0)
+                total_amount = child_stats.get('total_expenses', 0)
                 
                 st.write(f"{indent}├── {child} ({transaction_count} transactions, ${total_amount:.2f})")
-                self._display_category_tree_with_stats(child, hierarchy, level + 1)
+                self._display_category_tree_with_stats(child, hierarchy, stats, level + 1)
     
     def _create_database_backup(self, backup_name: str):
         """Create a backup of the current database."""
         try:
-            import shutil
-            import os
-            from pathlib import Path
-            
             # Create backups directory
             backup_dir = Path("data/backups")
             backup_dir.mkdir(parents=True, exist_ok=True)
@@ -3195,8 +3517,8 @@ class ExpenseTrackerUI:
             backup_filename = f"{backup_name}.db"
             backup_path = backup_dir / backup_filename
             
-            # Copy database file
-            shutil.copy2(self.db.db_path, backup_path)
+            # Copy through SQLite so pages still in the write-ahead log are included
+            self.db.backup_to(backup_path)
             
             # Create download link
             with open(backup_path, 'rb') as f:
@@ -3222,9 +3544,6 @@ class ExpenseTrackerUI:
     def _restore_database_backup(self, uploaded_backup):
         """Restore database from uploaded backup."""
         try:
-            import tempfile
-            import shutil
-            
             # Save uploaded file to temporary location
             with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp_file:
                 tmp_file.write(uploaded_backup.read())
@@ -3232,7 +3551,6 @@ class ExpenseTrackerUI:
             
             # Validate the backup file (basic SQLite check)
             try:
-                import sqlite3
                 with sqlite3.connect(tmp_path) as conn:
                     cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='transactions'")
                     if not cursor.fetchone():
@@ -3246,18 +3564,17 @@ class ExpenseTrackerUI:
             current_backup_name = f"pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             self._create_database_backup(current_backup_name)
             
-            # Replace current database
-            shutil.copy2(tmp_path, self.db.db_path)
+            # Replace current database contents (a file copy would bypass the write-ahead log)
+            self.db.restore_from(tmp_path)
             
             # Clean up temporary file
-            import os
             os.unlink(tmp_path)
             
             st.success("✅ Database restored successfully!")
             st.info("Your previous database was backed up before restoration.")
             
             # Reload data
-            self._load_data()
+            self._invalidate_data()
             st.experimental_rerun()
             
         except Exception as e:
@@ -25,9 +25,10 @@ def temp_db():
     db = DatabaseManager(db_path)
     yield db
     
-    # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    # Cleanup (including the write-ahead log files)
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.unlink(path)
 
 
 @pytest.fixture
@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime
+from io import BytesIO
 
 from app.csv_parser import CSVParser
 
@@ -127,4 +128,50 @@ invalid_date,01/16/2024,STARBUCKS,Food,Sale,-4.75,
         
         # Both should parse to the same date
         assert transactions[0].transaction_date == datetime(2024, 1, 15)
-        assert transactions[1].transaction_date == datetime(2024, 1, 15)
\ No newline at end of file
+        assert transactions[1].transaction_date == datetime(2024, 1, 15)
+    
+    def test_file_like_source(self, csv_parser, sample_csv_content):
+        """Test that an uploaded (binary) buffer can be validated, previewed and parsed repeatedly."""
+        uploaded = BytesIO(sample_csv_content.encode('utf-8'))
+        
+        result = csv_parser.validate_csv_format(uploaded, "auto")
+        assert result['valid'] is True
+        assert result['detected_format'] == 'chase'
+        
+        preview = csv_parser.get_csv_preview(uploaded, max_rows=2)
+        assert len(preview) == 2
+        
+        transactions = csv_parser.parse_csv_generic(uploaded, 'chase')
+        assert len(transactions) == 5
+        assert transactions[0].description == "STARBUCKS STORE #12345"
+    
+    def test_file_like_headerless_source(self, csv_parser):
+        """Test headerless detection reads the first lines of a binary buffer."""
+        uploaded = BytesIO(b"01/15/2024,-4.75,STARBUCKS\n01/16/2024,-29.99,AMAZON\n")
+        
+        assert csv_parser.detect_csv_format(uploaded) == 'wells_fargo_headerless'
+        assert len(csv_parser.parse_csv_generic(uploaded, 'wells_fargo_headerless')) == 2
+    
+    def test_parse_dataframe(self, csv_parser, sample_csv_content):
+        """Test that a frame read once can be previewed and parsed without re-reading the file."""
+        frame = csv_parser.read_csv_frame(BytesIO(sample_csv_content.encode('utf-8')), 'chase')
+        
+        assert len(frame) == 5
+        transactions = csv_parser.parse_dataframe(frame, 'chase')
+        assert [t.description for t in transactions] == [
+            t.description for t in csv_parser.parse_csv_generic(sample_csv_content, 'chase')
+        ]
+        
+        headerless = csv_parser.read_csv_frame(BytesIO(b"01/15/2024,-4.75,STARBUCKS\n"), 'wells_fargo_headerless')
+        assert list(headerless.columns) == [0, 1, 2]
+        assert len(csv_parser.parse_dataframe(headerless, 'wells_fargo_headerless')) == 1
+        
+        with pytest.raises(ValueError):
+            csv_parser.read_csv_frame(sample_csv_content, 'unknown_bank')
+        assert csv_parser.parse_dataframe(frame, 'unknown_bank') == []
+    
+    def test_file_like_empty_source(self, csv_parser):
+        """Test that an empty buffer is reported as empty."""
+        result = csv_parser.validate_csv_format(BytesIO(b""), "auto")
+        assert result['valid'] is False
+        assert "empty" in result['error_message'].lower()
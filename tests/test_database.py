@@ -1,8 +1,10 @@
 """Tests for database operations."""
 
+import sqlite3
 import pytest
-from datetime import datetime
+from datetime import datetime, date
 
+from app.db import DatabaseManager
 from app.models import Transaction
 
 
@@ -41,6 +43,14 @@ class TestDatabaseManager:
         count = temp_db.get_transaction_count()
         assert count == len(sample_transactions)
     
+    def test_insert_transactions_batch_ids_match_rows(self, temp_db, sample_transactions):
+        """Test that batch insert IDs map to the inserted rows in order."""
+        temp_db.insert_transaction(sample_transactions[0])
+        transaction_ids = temp_db.insert_transactions_batch(sample_transactions[1:])
+        
+        stored = {t.id: t.description for t in temp_db.get_all_transactions()}
+        assert [stored[tid] for tid in transaction_ids] == [t.description for t in sample_transactions[1:]]
+    
     def test_get_all_transactions(self, temp_db, sample_transactions):
         """Test retrieving all transactions."""
         # Insert sample transactions
@@ -152,6 +162,113 @@ class TestDatabaseManager:
         # Transaction should now exist
         assert temp_db.transaction_exists(transaction) is True
     
+    def test_transactions_exist_batch(self, temp_db, sample_transactions):
+        """Test batch duplicate detection agrees with transaction_exists."""
+        temp_db.insert_transactions_batch(sample_transactions[:2])
+        sample_transactions[3].description = sample_transactions[1].description.lower()
+        sample_transactions[3].transaction_date = sample_transactions[1].transaction_date
+        sample_transactions[3].amount = sample_transactions[1].amount
+        
+        flags = temp_db.transactions_exist_batch(sample_transactions)
+        
+        assert flags == [temp_db.transaction_exists(t) for t in sample_transactions]
+        assert flags == [True, True, False, True, False]
+        assert temp_db.transactions_exist_batch([]) == []
+    
+    def test_find_potential_duplicates_batch(self, temp_db, sample_transactions):
+        """Test batch potential-duplicate lookup agrees with the per-transaction query."""
+        temp_db.insert_transactions_batch(sample_transactions)
+        
+        batch = temp_db.find_potential_duplicates_batch(sample_transactions)
+        
+        for transaction, matches in zip(sample_transactions, batch):
+            expected = temp_db.find_potential_duplicates(transaction)
+            assert [m.id for m in matches] == [m.id for m in expected]
+            assert len(matches) == 1
+        assert temp_db.find_potential_duplicates_batch([]) == []
+    
+    def test_find_potential_duplicates_batch_uses_amount_date_index(self, temp_db):
+        """Test the batch duplicate query is served by the (amount, transaction_date) index."""
+        with sqlite3.connect(temp_db.db_path) as conn:
+            plan = conn.execute("""
+                EXPLAIN QUERY PLAN SELECT * FROM transactions
+                WHERE amount IN (?, ?) AND transaction_date BETWEEN ? AND ?
+            """, (1.0, 2.0, '2024-01-01', '2024-01-31')).fetchall()
+        
+        assert any('idx_amount_date' in row[-1] for row in plan)
+    
+    def test_content_hash_backfilled_for_existing_database(self, tmp_path, sample_transactions):
+        """Test that databases without the hash column are migrated and backfilled."""
+        db_path = str(tmp_path / "old.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE transactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    transaction_date TEXT NOT NULL,
+                    post_date TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    category TEXT NOT NULL DEFAULT 'Uncategorized',
+                    transaction_type TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    memo TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            transaction = sample_transactions[0]
+            conn.execute("""
+                INSERT INTO transactions
+                (transaction_date, post_date, description, category, transaction_type, amount, memo)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (transaction.transaction_date.isoformat(), transaction.post_date.isoformat(),
+                  transaction.description, transaction.category, transaction.transaction_type,
+                  float(transaction.amount), transaction.memo))
+        
+        db = DatabaseManager(db_path)
+        
+        assert db.transaction_exists(transaction) is True
+        assert db.transaction_exists(sample_transactions[1]) is False
+    
+    def test_update_transactions_batch_in_chunks(self, temp_db, sample_transactions, monkeypatch):
+        """Test that batch updates spanning several id chunks update every row."""
+        monkeypatch.setattr('app.db.IN_QUERY_CHUNK_SIZE', 2)
+        ids = temp_db.insert_transactions_batch(sample_transactions)
+        
+        updated = temp_db.update_transactions_batch(ids[:4], category="Travel")
+        
+        assert updated == 4
+        categories = [t.category for t in sorted(temp_db.get_all_transactions(), key=lambda t: t.id)]
+        assert categories == ["Travel"] * 4 + [sample_transactions[4].category]
+    
+    def test_content_hash_follows_updates(self, temp_db, sample_transactions):
+        """Test that editing a hashed field re-keys the transaction for duplicate detection."""
+        transaction = sample_transactions[0]
+        transaction_id = temp_db.insert_transaction(transaction)
+        
+        temp_db.update_transaction(transaction_id, description="RENAMED")
+        assert temp_db.transaction_exists(transaction) is False
+        
+        transaction.description = "renamed"
+        assert temp_db.transaction_exists(transaction) is True
+    
+    def test_write_ahead_logging_enabled(self, temp_db):
+        """Test that the database runs in WAL mode."""
+        with temp_db._connect() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    
+    def test_backup_and_restore(self, temp_db, sample_transactions, tmp_path):
+        """Test backing up and restoring through the SQLite backup API."""
+        temp_db.insert_transactions_batch(sample_transactions[:3])
+        backup_path = tmp_path / "backup.db"
+        
+        temp_db.backup_to(backup_path)
+        temp_db.insert_transactions_batch(sample_transactions[3:])
+        assert len(temp_db.get_all_transactions()) == 5
+        
+        temp_db.restore_from(backup_path)
+        restored = temp_db.get_all_transactions()
+        assert sorted(t.description for t in restored) == sorted(t.description for t in sample_transactions[:3])
+    
     def test_rename_category(self, temp_db, sample_transactions):
         """Test renaming a category across all transactions."""
         # Insert sample transactions
@@ -238,6 +355,70 @@ class TestDatabaseManager:
         assert payment_stats['total_income'] == 150.0
         assert payment_stats['net_amount'] == 150.0
     
+    def test_get_expense_payment_counts(self, temp_db, sample_transactions):
+        """Test counting expenses and payments in the database."""
+        assert temp_db.get_expense_payment_counts() == (0, 0)
+        
+        temp_db.insert_transactions_batch(sample_transactions)
+        
+        assert temp_db.get_expense_payment_counts() == (
+            sum(t.is_expense() for t in sample_transactions),
+            sum(t.is_payment() for t in sample_transactions)
+        )
+    
+    def test_get_aggregate_stats(self, temp_db, sample_transactions):
+        """Test dashboard totals computed in SQL, with and without filters."""
+        temp_db.insert_transactions_batch(sample_transactions)
+        
+        stats = temp_db.get_aggregate_stats()
+        assert stats['transactions'] == 5
+        assert stats['expense_count'] == 4
+        assert stats['total_expenses'] == pytest.approx(92.91)
+        assert stats['total_payments'] == pytest.approx(150.00)
+        assert stats['net_amount'] == pytest.approx(57.09)
+        assert stats['max_expense'] == pytest.approx(45.67)
+        assert stats['first_date'] == datetime(2024, 1, 15)
+        assert stats['last_date'] == datetime(2024, 1, 20)
+        assert stats['category_totals'] == pytest.approx({"Shopping": 75.66, "Food & Drink": 17.25})
+        assert stats['monthly'] == [("2024-01", pytest.approx(92.91))]
+        
+        # End dates include the whole day
+        stats = temp_db.get_aggregate_stats(start_date=date(2024, 1, 16), end_date=date(2024, 1, 18),
+                                            expenses_only=True, max_amount=20)
+        assert stats['transactions'] == 1
+        assert stats['total_expenses'] == pytest.approx(12.50)
+        assert stats['category_totals'] == pytest.approx({"Food & Drink": 12.50})
+        
+        stats = temp_db.get_aggregate_stats(category="Missing")
+        assert stats['transactions'] == 0
+        assert stats['total_expenses'] == 0
+        assert stats['first_date'] is None
+        assert stats['monthly'] == []
+    
+    def test_change_token(self, temp_db, sample_transactions):
+        """Test the change token stays put across reads and moves with writes from any manager."""
+        temp_db.insert_transactions_batch(sample_transactions)
+        token = temp_db.change_token()
+        
+        temp_db.get_all_transactions()
+        DatabaseManager(temp_db.db_path).get_transaction_count()
+        assert temp_db.change_token() == token
+        
+        DatabaseManager(temp_db.db_path).update_transaction_category(1, "Travel")
+        assert temp_db.change_token() != token
+    
+    def test_analyze(self, temp_db, sample_transactions):
+        """Test refreshing planner statistics and reporting size and indexes."""
+        temp_db.insert_transactions_batch(sample_transactions)
+        
+        info = temp_db.analyze()
+        
+        assert info['size'] > 0
+        assert 'idx_transaction_date' in info['indexes']
+        with sqlite3.connect(temp_db.db_path) as conn:
+            analyzed = {row[0] for row in conn.execute("SELECT tbl FROM sqlite_stat1")}
+        assert 'transactions' in analyzed
+    
     def test_empty_database_operations(self, temp_db):
         """Test operations on empty database."""
         # Test getting transactions from empty database
@@ -0,0 +1,47 @@
+"""Tests for export and import helpers."""
+
+import json
+
+import pytest
+
+from app.export_import import dumps_json, _dumps_json_stdlib
+
+
+class TestJsonSerialization:
+    """Test JSON text produced for exports."""
+
+    def test_dumps_json_round_trip(self):
+        """Test that exported JSON parses back to the same data, with non-ASCII text kept as-is."""
+        data = {
+            'metadata': {'version': '1.0', 'total_transactions': 2},
+            'transactions': [
+                {'id': 1, 'description': 'CAFÉ ÉCLAIR', 'amount': -4.75, 'memo': None},
+                {'id': 2, 'description': 'PAYMENT', 'amount': 150.0, 'memo': ''},
+            ],
+            'categories': [],
+        }
+
+        pretty = dumps_json(data)
+        compact = dumps_json(data, pretty=False)
+
+        assert json.loads(pretty) == data
+        assert json.loads(compact) == data
+        assert 'CAFÉ ÉCLAIR' in pretty
+        assert '\n  "metadata": {' in pretty
+        assert '\n' not in compact
+        assert compact.startswith('{"metadata":{"version":"1.0",')
+
+    def test_orjson_matches_standard_library(self):
+        """Test that orjson, when installed, writes the same text as the standard library."""
+        orjson = pytest.importorskip("orjson")
+        data = {
+            'metadata': {'version': '1.0', 'total_transactions': 2, 'ratios': [0.1, 1234.5, 12345678.9]},
+            'transactions': [{'id': 1, 'description': 'CAFÉ ÉCLAIR', 'amount': -4.75, 'memo': None}],
+            'counts': {1: 3, 2: 0},
+            'categories': [],
+            'empty': {},
+        }
+
+        for pretty in (True, False):
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            assert orjson.dumps(data, option=option).decode('utf-8') == _dumps_json_stdlib(data, pretty)
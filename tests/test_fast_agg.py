@@ -0,0 +1,62 @@
+"""Tests for the aggregation kernels."""
+
+import numpy as np
+
+from app.fast_agg import (
+    aggregate_by_category, aggregate_by_month, summarize_amounts, _sum_by_code_numpy, _amount_summary_numpy
+)
+
+
+class TestFastAggregation:
+    """Test per-category and per-month sums."""
+
+    def test_aggregate_by_category(self):
+        """Test sums and counts per category code, including unused codes."""
+        totals, counts = aggregate_by_category(np.array([0, 2, 0, 2, 2]), np.array([1.5, 2.0, 3.0, 4.0, 0.5]), 4)
+
+        assert totals.tolist() == [4.5, 0.0, 6.5, 0.0]
+        assert counts.tolist() == [2, 0, 3, 0]
+
+    def test_kernel_matches_numpy_fallback(self):
+        """Test the active kernel (numba when installed) agrees with the NumPy version."""
+        rng = np.random.default_rng(1)
+        codes = rng.integers(0, 20, 1000)
+        amounts = rng.random(1000) * 100
+
+        totals, counts = aggregate_by_category(codes, amounts, 20)
+        expected_totals, expected_counts = _sum_by_code_numpy(codes, amounts, 20)
+
+        np.testing.assert_allclose(totals, expected_totals)
+        assert counts.tolist() == expected_counts.tolist()
+
+    def test_aggregate_by_month(self):
+        """Test monthly sums skip empty months and come back in date order."""
+        dates = np.array(['2024-03-05', '2023-12-31', '2024-03-20', '2024-01-01'], dtype='datetime64[ns]')
+
+        months, totals = aggregate_by_month(dates, np.array([10.0, 1.0, 5.0, 2.0]))
+
+        assert np.datetime_as_string(months, unit='M').tolist() == ['2023-12', '2024-01', '2024-03']
+        assert totals.tolist() == [1.0, 2.0, 15.0]
+
+    def test_aggregate_by_month_empty(self):
+        """Test aggregating no rows."""
+        months, totals = aggregate_by_month(np.array([], dtype='datetime64[ns]'), np.array([]))
+
+        assert len(months) == 0
+        assert len(totals) == 0
+
+    def test_summarize_amounts(self):
+        """Test the one-pass dashboard figures against the NumPy version, skipping code -1 per category."""
+        rng = np.random.default_rng(2)
+        amounts = np.round(rng.normal(0, 50, 1000), 2)
+        codes = rng.integers(-1, 8, 1000)
+
+        summary = summarize_amounts(amounts, codes, 8)
+        expected = _amount_summary_numpy(amounts, codes, 8)
+
+        np.testing.assert_allclose(summary[:3], expected[:3])
+        assert summary[3] == expected[3] == (amounts < 0).sum()
+        np.testing.assert_allclose(summary[4], expected[4])
+        assert summary[5].tolist() == expected[5].tolist()
+        assert expected[2] == -amounts.min()
+        assert summary[5].sum() == ((amounts < 0) & (codes >= 0)).sum()
@@ -0,0 +1,278 @@
+"""Tests for columnar transaction frames."""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, date
+
+from app.models import Transaction
+from app.frames import (
+    transactions_to_frame, to_display_frame, transaction_labels, format_amounts, DISPLAY_COLUMNS,
+    day_array, date_range_bounds, category_summary, category_totals, monthly_totals, monthly_category_totals,
+    daily_totals, months_from_days, weekday_totals, month_labels, filter_mask, add_search_columns, search_mask,
+    sort_order, top_with_other, keyword_matches, expense_summary
+)
+
+
+class TestTransactionFrames:
+    """Test conversion between transactions and DataFrames."""
+
+    def test_frame_rows_align_with_transactions(self, sample_transactions):
+        """Test that frame row i describes transaction i."""
+        frame = transactions_to_frame(sample_transactions)
+
+        assert len(frame) == len(sample_transactions)
+        assert list(frame['description']) == [t.description for t in sample_transactions]
+        assert frame['amount'].tolist() == [float(t.amount) for t in sample_transactions]
+        assert str(frame['transaction_date'].dtype).startswith('datetime64')
+        assert frame['is_expense'].tolist() == [t.is_expense() for t in sample_transactions]
+        assert frame['is_payment'].tolist() == [t.is_payment() for t in sample_transactions]
+        assert frame['abs_amount'].tolist() == [abs(t.amount) for t in sample_transactions]
+        assert frame['category'].dtype == 'category'
+        assert list(frame['category']) == [t.category for t in sample_transactions]
+
+    def test_empty_frame(self):
+        """Test building a frame from no transactions."""
+        frame = transactions_to_frame([])
+
+        assert frame.empty
+        assert to_display_frame(frame).columns.tolist() == DISPLAY_COLUMNS
+
+    def test_display_frame_truncates_text(self):
+        """Test that long descriptions and memos are shortened for display."""
+        transaction = Transaction(
+            transaction_date=datetime(2024, 1, 15),
+            post_date=datetime(2024, 1, 16),
+            description="X" * 80,
+            category="Shopping",
+            transaction_type="Sale",
+            amount=-10.00,
+            memo="M" * 40
+        )
+
+        display = to_display_frame(transactions_to_frame([transaction]))
+        row = display.iloc[0]
+
+        assert display.columns.tolist() == DISPLAY_COLUMNS
+        assert row['Description'] == "X" * 60 + "..."
+        assert row['Memo'] == "M" * 30 + "..."
+        assert row['Date'] == datetime(2024, 1, 15).date()
+        assert row['Select'] == False
+        assert display['Category'].dtype == 'category'
+        assert display['Type'].dtype == 'category'
+
+    def test_display_frame_blank_memo(self, sample_transactions):
+        """Test that missing memos display as empty strings."""
+        sample_transactions[0].memo = None
+
+        display = to_display_frame(transactions_to_frame(sample_transactions))
+
+        assert display['Memo'].tolist() == [""] * len(sample_transactions)
+
+    def test_format_amounts(self):
+        """Test two-decimal amount formatting."""
+        amounts = pd.Series([-4.75, 150.0, 1234.5, -0.004, 10.0])
+
+        assert format_amounts(amounts).tolist() == ['-4.75', '150.00', '1234.50', '-0.00', '10.00']
+
+    def test_transaction_labels(self, sample_transactions):
+        """Test that picker labels match the per-row formatting."""
+        labels = transaction_labels(transactions_to_frame(sample_transactions))
+
+        expected = [
+            f"{t.transaction_date.strftime('%Y-%m-%d')} - {t.description[:50]} - ${t.amount:.2f}"
+            for t in sample_transactions
+        ]
+        assert labels == expected
+        assert transaction_labels(transactions_to_frame([])) == []
+
+    def test_date_range_bounds(self, sample_transactions):
+        """Test slicing a newest-first frame by an inclusive date range."""
+        newest_first = sorted(sample_transactions, key=lambda t: t.transaction_date, reverse=True)
+        days = day_array(transactions_to_frame(newest_first))
+
+        lo, hi = date_range_bounds(days, date(2024, 1, 16), date(2024, 1, 18))
+        assert [t.description for t in newest_first[lo:hi]] == [
+            "UBER EATS", "PAYMENT THANK YOU - WEB", "AMAZON.COM AMZN.COM/BILL"
+        ]
+
+        assert date_range_bounds(days, date(2024, 1, 1), date(2024, 12, 31)) == (0, 5)
+        lo, hi = date_range_bounds(days, date(2023, 1, 1), date(2023, 12, 31))
+        assert lo == hi
+
+    def test_filter_mask(self, sample_transactions):
+        """Test that the combined mask matches the per-row filter rules."""
+        frame = transactions_to_frame(sample_transactions)
+
+        mask = filter_mask(frame, category="Shopping", expenses_only=True)
+        assert mask.tolist() == [t.category == "Shopping" and t.is_expense() for t in sample_transactions]
+
+        mask = filter_mask(frame, payments_only=True, amount_range=(100, 200))
+        assert mask.tolist() == [t.is_payment() and 100 <= abs(t.amount) <= 200 for t in sample_transactions]
+
+        assert filter_mask(frame).all()
+        assert not filter_mask(frame, category="Missing").any()
+
+    def test_search_mask(self, sample_transactions):
+        """Test case-insensitive search over description, category and memo."""
+        sample_transactions[3].memo = "Team Lunch"
+        frame = add_search_columns(transactions_to_frame(sample_transactions))
+
+        def matches(term):
+            return [t.description for t, hit in zip(sample_transactions, search_mask(frame, term)) if hit]
+
+        assert matches("store") == ["STARBUCKS STORE #12345", "TARGET STORE T-1234"]
+        assert matches("SHOP") == ["AMAZON.COM AMZN.COM/BILL", "TARGET STORE T-1234"]
+        assert matches("lunch") == ["UBER EATS"]
+        assert matches(".com") == ["AMAZON.COM AMZN.COM/BILL"]
+        assert matches("nothing like this") == []
+
+    def test_keyword_matches(self, sample_transactions):
+        """Test that each row takes the first category with a matching keyword."""
+        frame = add_search_columns(transactions_to_frame(sample_transactions))
+        patterns = {
+            'Coffee': ['starbucks'],
+            'Shopping': ['amazon', 'store'],
+            'Dining': ['eats', 'starbucks'],
+        }
+
+        # STARBUCKS STORE, AMAZON.COM, PAYMENT THANK YOU, UBER EATS, TARGET STORE
+        assert keyword_matches(frame, patterns).tolist() == [0, 1, -1, 2, 1]
+        assert keyword_matches(frame, {'Dots': ['.com/']}).tolist() == [-1, 0, -1, -1, -1]
+
+    def test_sort_order_matches_list_sort(self, sample_transactions):
+        """Test that sort positions reproduce the stable list sorts."""
+        sample_transactions[1].description = "amazon.com"
+        frame = add_search_columns(transactions_to_frame(sample_transactions))
+        list_keys = {
+            'date': lambda t: t.transaction_date,
+            'amount': lambda t: abs(t.amount),
+            'description': lambda t: t.description.lower(),
+            'category': lambda t: t.category.lower(),
+        }
+
+        for key, list_key in list_keys.items():
+            for descending in (False, True):
+                expected = sorted(sample_transactions, key=list_key, reverse=descending)
+                order = sort_order(frame, key, descending)
+                assert [sample_transactions[i] for i in order] == expected, (key, descending)
+
+        with pytest.raises(ValueError):
+            sort_order(frame, 'memo')
+
+    def test_sort_order_limit(self):
+        """Test that a partial sort returns the same leading rows as a full sort."""
+        rng = np.random.default_rng(0)
+        transactions = [
+            Transaction(
+                transaction_date=datetime(2024, 1, 1 + int(day)),
+                post_date=datetime(2024, 1, 1 + int(day)),
+                description=f"Shop {index}",
+                category="Shopping",
+                transaction_type="Sale",
+                amount=-float(cents) / 100
+            )
+            for index, (day, cents) in enumerate(zip(rng.integers(0, 28, 400), rng.integers(1, 50, 400)))
+        ]
+        frame = add_search_columns(transactions_to_frame(transactions))
+
+        for key in ('date', 'amount'):
+            for descending in (False, True):
+                full = sort_order(frame, key, descending)
+                assert sort_order(frame, key, descending, limit=25).tolist() == full[:25].tolist()
+                assert sort_order(frame, key, descending, limit=300).tolist() == full[:300].tolist()
+
+    def test_category_totals(self, sample_transactions):
+        """Test per-category expense totals are sorted largest first."""
+        frame = transactions_to_frame(sample_transactions)
+        totals = category_totals(frame[frame['is_expense']])
+
+        assert totals.index.tolist() == ["Shopping", "Food & Drink"]
+        assert totals["Shopping"] == pytest.approx(75.66)
+        assert totals["Food & Drink"] == pytest.approx(17.25)
+
+    def test_category_summary(self, sample_transactions):
+        """Test per-category totals and transaction counts."""
+        frame = transactions_to_frame(sample_transactions)
+        summary = category_summary(frame[frame['is_expense']])
+
+        assert summary.index.tolist() == ["Shopping", "Food & Drink"]
+        assert summary['amount'].tolist() == pytest.approx([75.66, 17.25])
+        assert summary['count'].tolist() == [2, 2]
+
+    def test_top_with_other(self):
+        """Test folding the smallest categories into an Other entry."""
+        totals = pd.Series([50.0, 30.0, 15.0, 5.0], index=["Rent", "Food", "Gas", "Fees"])
+
+        folded = top_with_other(totals, limit=2)
+        assert folded.index.tolist() == ["Rent", "Food", "Other"]
+        assert folded.tolist() == [50.0, 30.0, 20.0]
+        assert top_with_other(totals, limit=4) is totals
+
+    def test_monthly_totals(self, sample_transactions):
+        """Test monthly buckets are built without per-row formatting."""
+        sample_transactions[0].transaction_date = datetime(2023, 12, 31)
+        frame = transactions_to_frame(sample_transactions)
+        totals = monthly_totals(frame[frame['is_expense']])
+
+        assert month_labels(totals.index).tolist() == ["2023-12", "2024-01"]
+        assert totals.tolist() == pytest.approx([4.75, 88.16])
+
+    def test_monthly_category_totals(self, sample_transactions):
+        """Test the month-by-category pivot for selected categories."""
+        sample_transactions[0].transaction_date = datetime(2023, 12, 31)
+        frame = transactions_to_frame(sample_transactions)
+        table = monthly_category_totals(frame[frame['is_expense']], ["Shopping", "Food & Drink", "Travel"])
+
+        assert table.columns.tolist() == ["Shopping", "Food & Drink", "Travel"]
+        assert month_labels(table.index).tolist() == ["2023-12", "2024-01"]
+        assert table.to_numpy().ravel().tolist() == pytest.approx([0, 4.75, 0, 75.66, 12.50, 0])
+
+    def test_daily_totals(self, sample_transactions):
+        """Test per-day buckets in date order."""
+        sample_transactions[2].transaction_date = sample_transactions[1].transaction_date
+        frame = transactions_to_frame(sample_transactions)
+        totals = daily_totals(frame[frame['is_expense']])
+
+        expected = {}
+        for t in sorted(sample_transactions, key=lambda t: t.transaction_date):
+            if t.is_expense():
+                day = t.transaction_date.strftime('%Y-%m-%d')
+                expected[day] = expected.get(day, 0) + abs(t.amount)
+        assert np.datetime_as_string(totals.index.to_numpy(), unit='D').tolist() == list(expected)
+        assert totals.tolist() == pytest.approx(list(expected.values()))
+
+    def test_months_from_days(self, sample_transactions):
+        """Test that rolling daily totals up gives the monthly totals."""
+        sample_transactions[0].transaction_date = datetime(2023, 12, 31)
+        frame = transactions_to_frame(sample_transactions)
+        expenses = frame[frame['is_expense']]
+
+        rolled = months_from_days(daily_totals(expenses))
+        direct = monthly_totals(expenses)
+
+        assert month_labels(rolled.index).tolist() == month_labels(direct.index).tolist()
+        assert rolled.tolist() == pytest.approx(direct.tolist())
+
+    def test_weekday_totals(self, sample_transactions):
+        """Test per-weekday buckets, Monday first."""
+        frame = transactions_to_frame(sample_transactions)
+        totals = weekday_totals(frame[frame['is_expense']])
+
+        expected = [0.0] * 7
+        for t in sample_transactions:
+            if t.is_expense():
+                expected[t.transaction_date.weekday()] += abs(t.amount)
+        assert totals.tolist() == pytest.approx(expected)
+
+    def test_expense_summary(self, sample_transactions):
+        """Test the dashboard totals match the per-transaction definitions."""
+        frame = transactions_to_frame(sample_transactions)
+        summary = expense_summary(frame)
+
+        expenses = [abs(t.amount) for t in sample_transactions if t.is_expense()]
+        assert summary['total_expenses'] == pytest.approx(sum(expenses))
+        assert summary['total_payments'] == pytest.approx(sum(t.amount for t in sample_transactions if t.is_payment()))
+        assert summary['max_expense'] == pytest.approx(max(expenses))
+        assert summary['expense_count'] == len(expenses)
+        assert summary['category_totals'].equals(category_totals(frame[frame['is_expense']]))
@@ -197,4 +197,34 @@ class TestTransaction:
         )
         
         assert transaction1 == transaction2
-        assert transaction1 != transaction3
\ No newline at end of file
+        assert transaction1 != transaction3
+    
+    def test_transaction_content_hash(self):
+        """Test the duplicate-detection hash ignores description case, post date and category."""
+        transaction = Transaction(
+            transaction_date=datetime(2024, 1, 15),
+            post_date=datetime(2024, 1, 16),
+            description="STARBUCKS",
+            category="Food",
+            transaction_type="Sale",
+            amount=Decimal("-4.75")
+        )
+        same = Transaction(
+            transaction_date=datetime(2024, 1, 15),
+            post_date=datetime(2024, 1, 17),
+            description="Starbucks",
+            category="Coffee",
+            transaction_type="Sale",
+            amount=-4.75
+        )
+        different_amount = Transaction(
+            transaction_date=datetime(2024, 1, 15),
+            post_date=datetime(2024, 1, 16),
+            description="STARBUCKS",
+            category="Food",
+            transaction_type="Sale",
+            amount=-4.76
+        )
+        
+        assert transaction.content_hash() == same.content_hash()
+        assert transaction.content_hash() != different_amount.content_hash()